@@ -0,0 +1,122 @@
+"""Comment thread rendering benchmark.
+
+Used by `manage.py bench_comment_render`. Compares the iterative
+`{% comment_thread %}` tag with the recursive `{% include %}` markup it
+replaced, on in-memory threads, so nothing touches the database.
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.template import Context, Engine, Template
+from django.utils import timezone
+
+from apps.submissions.markdown import RENDERER_VERSION
+from apps.submissions.models import Submission
+
+from .models import Comment, path_segment
+
+# partials/comment.html before the iterative renderer, for comparison
+RECURSIVE_COMMENT = """<div class="comment" id="comment-{{ comment.pk }}">
+  <p>{% if submission.is_anonymous and comment.user_id == submission.user_id %}[ anonymous ]{% else %}<a href="{% url 'user_profile' comment.user.username %}">{{ comment.user.username }}</a>{% endif %}</strong>{% if comment.user_id == submission.user_id %} (submission owner){% endif %} - <time datetime="{{ comment.created_at|date:'c' }}">{{ comment.created_at|date:"M j, Y H:i" }}</time></p>
+  {% if comment.is_deleted %}
+    <p>[This comment is deleted by owner]</p>
+  {% else %}
+    <p>{{ comment.content_html|safe }}</p>
+    {# Marker for this viewer's Reply/Edit/Delete; {% comment_actions %} fills it in outside the cache #}
+    <!--comment-actions:{{ comment.pk }}:{{ comment.user_id }}-->
+  {% endif %}
+  {% if comment.children %}
+    <div class="comment-list">
+      {% for reply in comment.children %}
+        {% include 'recursive/comment.html' with comment=reply submission=submission %}
+      {% endfor %}
+    </div>
+  {% endif %}
+</div>
+"""
+RECURSIVE_THREAD = """{% for comment in comments %}
+        {% include 'recursive/comment.html' with comment=comment submission=submission %}
+      {% endfor %}"""
+
+ITERATIVE_THREAD = "{% load comment_thread %}{% comment_thread comments %}"
+
+
+def recursive_engine() -> Engine:
+    templates = {"recursive/comment.html": RECURSIVE_COMMENT, "recursive/thread.html": RECURSIVE_THREAD}
+    return Engine(loaders=[("django.template.loaders.locmem.Loader", templates)])
+
+
+def build_thread(size: int, seed: int = 0):
+    """Return `(submission, comments)` with `size` unsaved comments in display order.
+
+    About a third of the comments start a thread; the rest reply to a
+    random earlier comment. Each comment also gets its `children`, as
+    `Comment.objects.thread()` would set them.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    users = [User(pk=i, username=f"user{i}") for i in range(1, 21)]
+    submission = Submission(pk=1, slug="bench", user=users[0], project_name="Bench")
+    start = timezone.now() - timedelta(days=30)
+    comments = []
+    for pk in range(1, size + 1):
+        parent = rng.choice(comments) if comments and rng.random() > 0.3 else None
+        user = rng.choice(users)
+        comment = Comment(
+            pk=pk,
+            user=user,
+            submission=submission,
+            parent=parent,
+            content="",
+            created_at=start + timedelta(minutes=pk),
+            is_deleted=rng.random() < 0.05,
+            rendered_html=f"<p>Comment {pk} by {user.username}</p>",
+            html_version=RENDERER_VERSION,
+            path=(parent.path if parent else "") + path_segment(pk),
+            depth=parent.depth + 1 if parent else 0,
+        )
+        comment.children = []
+        if parent:
+            parent.children.append(comment)
+        comments.append(comment)
+    comments.sort(key=lambda c: c.path)
+    return submission, comments
+
+
+def render_recursive(engine, submission, comments) -> str:
+    roots = [c for c in comments if c.parent_id is None]
+    return engine.get_template("recursive/thread.html").render(
+        Context({"submission": submission, "comments": roots})
+    )
+
+
+def render_iterative(submission, comments) -> str:
+    return Template(ITERATIVE_THREAD).render(Context({"submission": submission, "comments": comments}))
+
+
+def run(sizes, iterations: int = 5, seed: int = 0) -> dict:
+    """Time both renderers per thread size; report medians in ms and whether outputs match."""
+    engine = recursive_engine()
+    results = {}
+    for size in sizes:
+        submission, comments = build_thread(size, seed)
+        timings = {"recursive": [], "iterative": []}
+        for _ in range(iterations):
+            started = time.perf_counter()
+            recursive = render_recursive(engine, submission, comments)
+            timings["recursive"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            iterative = render_iterative(submission, comments)
+            timings["iterative"].append(time.perf_counter() - started)
+        recursive_ms = statistics.median(timings["recursive"]) * 1000
+        iterative_ms = statistics.median(timings["iterative"]) * 1000
+        results[size] = {
+            "recursive_ms": round(recursive_ms, 2),
+            "iterative_ms": round(iterative_ms, 2),
+            "speedup": round(recursive_ms / iterative_ms, 2) if iterative_ms else None,
+            "identical": recursive == iterative,
+        }
+    return results
@@ -1,4 +1,7 @@
 from django import forms
+
+from apps.submissions.forms import apply_max_length
+from apps.submissions.markdown import max_length
 from .models import Comment
 
 
@@ -10,3 +13,9 @@ class CommentForm(forms.ModelForm):
             "content": forms.Textarea(attrs={"rows": 3}),
             "parent": forms.HiddenInput(),
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        limit = max_length("comment")
+        if limit:
+            apply_max_length(self.fields["content"], limit)
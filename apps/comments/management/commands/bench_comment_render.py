@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.comments import bench
+
+
+class Command(BaseCommand):
+    help = "Compare recursive-include and iterative comment thread rendering."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Comments per thread"
+        )
+        parser.add_argument("--iterations", type=int, default=5, help="Renders per size and renderer")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for thread shapes")
+
+    def handle(self, *args, **opts):
+        results = bench.run(opts["sizes"], iterations=max(1, opts["iterations"]), seed=opts["seed"])
+        self.stdout.write(f"{'comments':>9}{'recursive ms':>14}{'iterative ms':>14}{'speedup':>9}  output")
+        for size, r in results.items():
+            same = "identical" if r["identical"] else "DIFFERS"
+            self.stdout.write(
+                f"{size:>9}{r['recursive_ms']:>14}{r['iterative_ms']:>14}{r['speedup']:>8}x  {same}"
+            )
+        if not all(r["identical"] for r in results.values()):
+            self.stdout.write(self.style.WARNING("Renderers produced different output."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from apps.comments.models import Comment
+from apps.submissions.markdown import RENDERER_VERSION
+
+
+class Command(BaseCommand):
+    help = "Re-render stored comment HTML, e.g. after ALLOWED_TAGS changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows written per UPDATE batch")
+        parser.add_argument("--all", action="store_true", help="Re-render every comment, not only stale ones")
+
+    def handle(self, *args, **opts):
+        batch_size = max(1, int(opts["batch_size"]))
+        qs = Comment.objects.only("pk", "content")
+        if not opts["all"]:
+            qs = qs.exclude(html_version=RENDERER_VERSION)
+
+        total = 0
+        batch = []
+        for comment in qs.iterator(chunk_size=batch_size):
+            comment.render_html()
+            batch.append(comment)
+            if len(batch) >= batch_size:
+                Comment.objects.bulk_update(batch, ["rendered_html", "html_version"])
+                total += len(batch)
+                batch = []
+        if batch:
+            Comment.objects.bulk_update(batch, ["rendered_html", "html_version"])
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Re-rendered {total} comments (renderer v{RENDERER_VERSION})."))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0002_comment_is_deleted_comment_parent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="html_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="rendered_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
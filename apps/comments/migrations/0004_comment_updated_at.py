@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:05
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def backfill_updated_at(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    Comment.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0003_store_rendered_html"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def segment(pk):
+    digits = ""
+    while pk:
+        pk, rem = divmod(pk, 36)
+        digits = ALPHABET[rem] + digits
+    return digits.rjust(6, "0")
+
+
+def backfill_paths(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    comments = {c.pk: c for c in Comment.objects.only("pk", "parent_id")}
+    done = {}
+
+    def resolve(comment):
+        # Iterative walk up to the nearest resolved ancestor
+        chain = []
+        while comment.pk not in done:
+            chain.append(comment)
+            if comment.parent_id is None:
+                break
+            comment = comments[comment.parent_id]
+        for node in reversed(chain):
+            parent = done.get(node.parent_id)
+            prefix, depth = (parent[0], parent[1] + 1) if parent else ("", 0)
+            node.path, node.depth = prefix + segment(node.pk), depth
+            done[node.pk] = (node.path, node.depth)
+
+    for comment in comments.values():
+        resolve(comment)
+    Comment.objects.bulk_update(comments.values(), ["path", "depth"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0004_comment_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["submission", "path"], name="comment_thread_path_idx"),
+        ),
+    ]
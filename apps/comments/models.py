@@ -1,11 +1,82 @@
+from collections import defaultdict
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Subquery, Value
+from django.db.models.functions import Coalesce
 
+from apps.core.models import DirtyFieldsMixin
 from apps.submissions.models import Submission
-from apps.submissions.markdown import render_markdown
+from apps.submissions.markdown import RENDERER_VERSION, cached_render_markdown_checked
+
+
+# Each path segment is the comment's pk in fixed-width base 36, so sorting by
+# path lists a thread depth-first with siblings in creation order.
+PATH_STEP = 6
+PATH_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+# Sorts after every path; bounds "the rest of the submission" in range scans
+PATH_END = "~"
+PATH_MAX_LENGTH = 255
+# Deepest reply level whose path still fits the column
+MAX_DEPTH = PATH_MAX_LENGTH // PATH_STEP - 1
+
+
+def path_segment(pk: int) -> str:
+    digits = ""
+    while pk:
+        pk, rem = divmod(pk, 36)
+        digits = PATH_ALPHABET[rem] + digits
+    return digits.rjust(PATH_STEP, "0")
+
+
+class CommentQuerySet(models.QuerySet):
+    def subtree(self, comment):
+        """`comment` and all of its replies, in display order."""
+        # A range rather than startswith, which SQLite runs as LIKE and cannot
+        # serve from the (submission, path) index
+        return self.filter(
+            submission_id=comment.submission_id,
+            path__gte=comment.path,
+            path__lt=comment.path + PATH_END,
+        ).order_by("path")
+
+    def first_threads(self, submission, count):
+        """The first `count` top-level comments of `submission` with all their replies.
 
+        One range scan over (submission, path): everything before the path
+        of the next top-level comment, found by a subquery.
+        """
+        following = (
+            self.model.objects.filter(submission=submission, depth=0)
+            .order_by("path")
+            .values("path")[count:count + 1]
+        )
+        return self.filter(
+            submission=submission, path__lt=Coalesce(Subquery(following), Value(PATH_END))
+        ).order_by("path")
 
-class Comment(models.Model):
+    def display_order(self):
+        """Comments with their authors, depth-first in display order."""
+        return self.select_related("user").order_by("path")
+
+    def thread(self):
+        """Load the comments with their authors in one query and nest replies.
+
+        Returns the comments whose parent is not in the queryset (the
+        top-level ones, or a subtree's root); each comment gets a `children`
+        list of its replies in display order.
+        """
+        comments = list(self.display_order())
+        children = defaultdict(list)
+        for comment in comments:
+            children[comment.parent_id].append(comment)
+        for comment in comments:
+            comment.children = children[comment.pk]
+        loaded = {comment.pk for comment in comments}
+        return [comment for comment in comments if comment.parent_id not in loaded]
+
+
+class Comment(DirtyFieldsMixin, models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     submission = models.ForeignKey(
         Submission, on_delete=models.CASCADE, related_name="comments"
@@ -15,15 +86,59 @@ class Comment(models.Model):
     )
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_deleted = models.BooleanField(default=False)
+    rendered_html = models.TextField(blank=True, default="", editable=False)
+    html_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Materialized path (see PATH_STEP) and nesting level, set on insert
+    path = models.CharField(max_length=PATH_MAX_LENGTH, default="", editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [models.Index(fields=["submission", "path"], name="comment_thread_path_idx")]
 
     def __str__(self):
         return f"Comment by {self.user.username} on {self.submission.project_name}"
 
+    def save(self, *args, **kwargs):
+        self.render_html()
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            self._snapshot()
+            return
+        # Replies to a comment at MAX_DEPTH become its siblings instead of nesting deeper
+        while self.parent is not None and self.parent.depth >= MAX_DEPTH:
+            self.parent = self.parent.parent
+        # The path ends with our own pk, so it is written right after the insert.
+        # Cache generations are bumped on commit, once both writes are visible.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.set_path()
+        self._snapshot()
+
+    def set_path(self):
+        parent = self.parent
+        if parent is None:
+            self.path, self.depth = path_segment(self.pk), 0
+        else:
+            self.path, self.depth = parent.path + path_segment(self.pk), parent.depth + 1
+        Comment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+
+    def render_html(self):
+        self.rendered_html, completed = cached_render_markdown_checked(self.content, profile="comment")
+        # A budget fallback stays stale so content_html renders it again
+        self.html_version = RENDERER_VERSION if completed else 0
+
     @property
     def content_html(self) -> str:
-        """Return sanitized HTML version of the comment content."""
-        return render_markdown(self.content)
+        """Return sanitized HTML, upgrading rows rendered by an older version."""
+        if self.html_version != RENDERER_VERSION:
+            self.render_html()
+            if self.pk:
+                Comment.objects.filter(pk=self.pk).update(
+                    rendered_html=self.rendered_html, html_version=self.html_version
+                )
+        return self.rendered_html
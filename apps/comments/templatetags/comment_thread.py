@@ -0,0 +1,120 @@
+import re
+
+from django import template
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+COMMENT_TEMPLATE = "partials/comment.html"
+# Left by partials/comment.html where the viewer's action links go: pk and author id
+ACTIONS_MARKER = re.compile(r"<!--comment-actions:(\d+):(\w+)-->")
+
+
+def _join(rendered):
+    # Same whitespace the {% for %}/{% include %} markup used to emit
+    return "".join(f"\n        {html}\n      " for html in rendered)
+
+
+def _flush(pending, depth):
+    """Pop everything waiting deeper than `depth`, last first.
+
+    In a gap-free thread that is just the level below `depth`. Deeper
+    levels only hold comments whose parent is missing; they come earlier in
+    display order, so they go after the shallower ones.
+    """
+    flushed = []
+    for level in sorted(level for level in pending if level > depth):
+        flushed.extend(pending.pop(level))
+    return flushed
+
+
+@register.simple_tag(takes_context=True)
+def comment_thread(context, comments):
+    """Render a thread from its comments in display order (by `path`).
+
+    Comments are visited in reverse, so every comment's replies are rendered
+    before it and reach `partials/comment.html` joined as `replies`. The
+    template is loaded once and profile URLs are reversed here, once per
+    user, instead of by `{% url %}` in a recursive `{% include %}`.
+
+    A comment whose parent is missing from the list (say, a slice of a
+    thread) is nested under its nearest ancestor that is present, or
+    rendered at the top level, rather than dropped.
+    """
+    comments = list(comments)
+    if not comments:
+        return ""
+    tmpl = context.template.engine.get_template(COMMENT_TEMPLATE)
+    profile_urls = {}
+    # depth -> rendered comments, last first, waiting for their parent
+    pending = {}
+    for comment in reversed(comments):
+        replies = _flush(pending, comment.depth)
+        username = comment.user.username
+        if username not in profile_urls:
+            profile_urls[username] = reverse("user_profile", args=[username])
+        with context.push(
+            comment=comment,
+            replies=mark_safe(_join(reversed(replies))),
+            profile_url=profile_urls[username],
+        ):
+            pending.setdefault(comment.depth, []).append(tmpl.render(context))
+    return mark_safe(_join(reversed(_flush(pending, -1))))
+
+
+class CommentActionsNode(template.Node):
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        html = self.nodelist.render(context)
+        user = context.get("user")
+        if user is None or not user.is_authenticated:
+            return ACTIONS_MARKER.sub("", html)
+        can_comment = context.get("can_comment")
+        form_url = reverse("comment_form")
+        csrf_token = context.get("csrf_token")
+
+        def actions(match):
+            pk, author_id = match.groups()
+            links = []
+            if can_comment:
+                links.append(format_html('<a href="{}?parent={}">Reply</a>', form_url, pk))
+            if author_id == str(user.pk):
+                links.append(format_html('<a href="{}?comment={}">Edit</a>', form_url, pk))
+                links.append(format_html(
+                    '<form method="post" action="{}">'
+                    '<input type="hidden" name="csrfmiddlewaretoken" value="{}">'
+                    '<button type="submit">Delete</button></form>',
+                    reverse("comment_delete", kwargs={"pk": pk}),
+                    csrf_token,
+                ))
+            if not links:
+                return ""
+            return format_html(
+                '<div class="actions comment-actions">\n      {}\n    </div>',
+                format_html_join("\n      ", "{}", ((link,) for link in links)),
+            )
+
+        return mark_safe(ACTIONS_MARKER.sub(actions, html))
+
+
+@register.tag
+def comment_actions(parser, token):
+    """Fill in the viewer's Reply/Edit/Delete controls in a rendered thread.
+
+    Usage::
+
+        {% comment_actions %}
+          {% fragment_cache ... %}{% comment_thread comments %}{% endfragment_cache %}
+        {% endcomment_actions %}
+
+    The thread, cached or not, only holds markers; this runs per request, so
+    one cached copy serves every visitor and anonymous visitors and crawlers
+    get no action links at all. Delete is a POST form carrying the CSRF token.
+    """
+    nodelist = parser.parse(("endcomment_actions",))
+    parser.delete_first_token()
+    return CommentActionsNode(nodelist)
@@ -1,8 +1,14 @@
-from django.test import TestCase
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from apps.core.cache import generation
+from apps.core.testing import LOCMEM_CACHE
+from apps.submissions.markdown import RENDERER_VERSION
 from apps.submissions.models import Submission
-from .models import Comment
+from .models import MAX_DEPTH, Comment, path_segment
 from .forms import CommentForm
 
 
@@ -58,6 +64,141 @@ class CommentModelTests(TestCase):
         self.assertIn("<strong>bold</strong>", html)
         self.assertNotIn("<span>", html)
 
+    def test_rendered_html_stored_on_save(self):
+        comment = Comment.objects.create(
+            user=self.user,
+            submission=self.submission,
+            content="*hi*",
+        )
+        comment.refresh_from_db()
+        self.assertEqual(comment.html_version, RENDERER_VERSION)
+        self.assertEqual(comment.rendered_html, "<p><em>hi</em></p>")
+
+    def test_stale_html_upgraded_on_read(self):
+        comment = Comment.objects.create(
+            user=self.user,
+            submission=self.submission,
+            content="*hi*",
+        )
+        Comment.objects.filter(pk=comment.pk).update(rendered_html="old", html_version=0)
+        comment.refresh_from_db()
+        self.assertEqual(comment.content_html, "<p><em>hi</em></p>")
+        comment.refresh_from_db()
+        self.assertEqual(comment.html_version, RENDERER_VERSION)
+        self.assertEqual(comment.rendered_html, "<p><em>hi</em></p>")
+
+    @override_settings(MARKDOWN_RENDER_TIMEOUT=0.001, MARKDOWN_GUARD_MIN_LENGTH=100)
+    def test_budget_fallback_leaves_html_stale(self):
+        comment = Comment.objects.create(
+            user=self.user,
+            submission=self.submission,
+            content="*a **b " * 5000,
+        )
+        comment.refresh_from_db()
+        self.assertTrue(comment.rendered_html.startswith("<p>*a **b"))
+        self.assertEqual(comment.html_version, 0)
+
+    def test_rerender_comments_command(self):
+        comment = Comment.objects.create(
+            user=self.user,
+            submission=self.submission,
+            content="**bold**",
+        )
+        Comment.objects.filter(pk=comment.pk).update(rendered_html="old", html_version=0)
+        out = StringIO()
+        call_command("rerender_comments", stdout=out)
+        comment.refresh_from_db()
+        self.assertEqual(comment.rendered_html, "<p><strong>bold</strong></p>")
+        self.assertIn("Re-rendered 1 comments", out.getvalue())
+
+
+class CommentPathTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="pathuser", password="pw")
+        self.submission = Submission.objects.create(
+            user=self.user,
+            project_name="Paths",
+            tagline="t",
+            idea="i",
+            tech="t",
+            failure="f",
+            lessons="l",
+        )
+
+    def comment(self, parent=None):
+        return Comment.objects.create(
+            user=self.user, submission=self.submission, content="c", parent=parent
+        )
+
+    def test_path_and_depth_set_on_insert(self):
+        top = self.comment()
+        reply = self.comment(top)
+        self.assertEqual(top.path, path_segment(top.pk))
+        self.assertEqual(reply.path, top.path + path_segment(reply.pk))
+        self.assertEqual(reply.depth, 1)
+        reply.refresh_from_db()
+        self.assertEqual((reply.path, reply.depth), (top.path + path_segment(reply.pk), 1))
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_insert_bumps_after_commit(self):
+        namespace = f"submission:{self.submission.slug}"
+        before = generation(namespace)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.comment()
+            # Readers refilling now would still see the thread without it
+            self.assertEqual(generation(namespace), before)
+        self.assertGreater(generation(namespace), before)
+
+    def test_edit_keeps_path(self):
+        top = self.comment()
+        top.content = "edited"
+        top.save()
+        top.refresh_from_db()
+        self.assertEqual(top.path, path_segment(top.pk))
+
+    def test_path_order_is_display_order(self):
+        first = self.comment()
+        second = self.comment()
+        first_reply = self.comment(first)
+        nested = self.comment(first_reply)
+        ordered = list(Comment.objects.filter(submission=self.submission).order_by("path"))
+        self.assertEqual(ordered, [first, first_reply, nested, second])
+
+    def test_subtree(self):
+        first = self.comment()
+        reply = self.comment(first)
+        nested = self.comment(reply)
+        self.comment(first)
+        self.comment()
+        self.assertEqual(list(Comment.objects.subtree(reply)), [reply, nested])
+        roots = Comment.objects.subtree(reply).thread()
+        self.assertEqual(roots, [reply])
+        self.assertEqual(roots[0].children, [nested])
+
+    def test_subtree_uses_path_range(self):
+        top = self.comment()
+        sql = str(Comment.objects.subtree(top).query)
+        self.assertNotIn("LIKE", sql)
+
+    def test_replies_stop_nesting_at_max_depth(self):
+        parent = None
+        for _ in range(MAX_DEPTH + 1):
+            parent = self.comment(parent)
+        self.assertEqual(parent.depth, MAX_DEPTH)
+        reply = self.comment(parent)
+        self.assertEqual(reply.depth, MAX_DEPTH)
+        self.assertEqual(reply.parent_id, parent.parent_id)
+        self.assertLessEqual(len(reply.path), Comment._meta.get_field("path").max_length)
+
+    def test_first_threads(self):
+        first, second, third = self.comment(), self.comment(), self.comment()
+        replies = [self.comment(first), self.comment(second)]
+        with self.assertNumQueries(1):
+            rows = list(Comment.objects.first_threads(self.submission, 2))
+        self.assertEqual(rows, [first, replies[0], second, replies[1]])
+        self.assertEqual(len(Comment.objects.first_threads(self.submission, 10)), 5)
+        self.assertNotIn(third, rows)
+
 
 class CommentFormTests(TestCase):
     def test_valid_form(self):
@@ -77,6 +218,11 @@ class CommentFormTests(TestCase):
         form = CommentForm()
         self.assertEqual(form.fields["content"].widget.attrs.get("rows"), 3)
 
+    @override_settings(MARKDOWN_MAX_LENGTHS={"comment": 5})
+    def test_content_length_limit(self):
+        self.assertFalse(CommentForm(data={"content": "x" * 6}).is_valid())
+        self.assertTrue(CommentForm(data={"content": "x" * 5}).is_valid())
+
 
 class CommentViewMessageTests(TestCase):
     def setUp(self):
@@ -125,3 +271,45 @@ class CommentViewMessageTests(TestCase):
         resp = self.client.post(url, follow=True)
         messages = [str(m) for m in resp.context["messages"]]
         self.assertIn("Comment deleted successfully.", messages)
+
+    def test_delete_comment_rejects_get(self):
+        c = Comment.objects.create(
+            user=self.user,
+            submission=self.submission,
+            content="Keep me",
+        )
+        resp = self.client.get(reverse("comment_delete", args=[c.pk]))
+        self.assertEqual(resp.status_code, 405)
+        c.refresh_from_db()
+        self.assertFalse(c.is_deleted)
+
+
+class CommentThreadRenderTests(TestCase):
+    def test_iterative_matches_recursive_include(self):
+        from . import bench
+
+        engine = bench.recursive_engine()
+        for seed in range(3):
+            submission, comments = bench.build_thread(60, seed=seed)
+            self.assertEqual(
+                bench.render_iterative(submission, comments),
+                bench.render_recursive(engine, submission, comments),
+            )
+
+    def test_comments_missing_their_parent_are_kept(self):
+        import re
+
+        from . import bench
+
+        submission, comments = bench.build_thread(60, seed=1)
+        # Drop a reply that has replies of its own; its subtree loses its parent
+        gap = next(c for c in comments if c.depth and c.children)
+        kept = [c for c in comments if c is not gap]
+        html = bench.render_iterative(submission, kept)
+        rendered = [int(pk) for pk in re.findall(r'id="comment-(\d+)"', html)]
+        self.assertEqual(rendered, [c.pk for c in kept])
+
+    def test_bench_command(self):
+        out = StringIO()
+        call_command("bench_comment_render", "--sizes", "5", "--iterations", "1", stdout=out)
+        self.assertIn("identical", out.getvalue())
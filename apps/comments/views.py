@@ -72,7 +72,8 @@ class CommentView(LoginRequiredMixin, View):
 
 
 class CommentDeleteView(LoginRequiredMixin, View):
-    def _delete(self, request, pk):
+    # POST only: a GET that deletes can be triggered by crawlers and prefetchers
+    def post(self, request, pk):
         comment = get_object_or_404(
             Comment, pk=pk, user=request.user, is_deleted=False
         )
@@ -80,9 +81,3 @@ class CommentDeleteView(LoginRequiredMixin, View):
         comment.save()
         messages.success(request, "Comment deleted successfully.")
         return redirect(comment.submission.get_absolute_url())
-
-    def post(self, request, pk):
-        return self._delete(request, pk)
-
-    def get(self, request, pk):
-        return self._delete(request, pk)
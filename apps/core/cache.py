@@ -0,0 +1,267 @@
+import hashlib
+import logging
+import math
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.core.cache import cache
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Cached value plus what early recomputation needs: how long the last compute
+# took (seconds) and when the value goes stale (epoch seconds).
+CacheEntry = namedtuple('CacheEntry', 'value delta expires')
+
+
+class LRUCache:
+    """Bounded, thread-safe in-process LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def hit_rate_limit(key: str, limit: int, period: int) -> bool:
+    """Count one hit against a fixed-window limit; True when over the limit."""
+    window_key = f"ratelimit:{key}:{int(time.time() // period)}"
+    cache.add(window_key, 0, period)
+    try:
+        hits = cache.incr(window_key)
+    except ValueError:
+        # Window expired or was culled between add() and incr()
+        cache.set(window_key, 1, period)
+        hits = 1
+    return hits > limit
+
+
+def _entry(raw):
+    return raw if isinstance(raw, CacheEntry) else None
+
+
+def _compute_and_store(key, compute, timeout, grace):
+    start = time.time()
+    value = compute()
+    delta = time.time() - start
+    cache.set(key, CacheEntry(value, delta, time.time() + timeout), timeout + grace)
+    return value
+
+
+def get_or_compute(key, compute, timeout, *, beta=1.0, grace=None, lock_timeout=30, wait=2.0):
+    """Return the cached value for `key`, calling `compute()` to fill or refresh it.
+
+    Values are kept `grace` seconds (default: `timeout`) past going stale.
+    Before that, each reader may refresh early with a probability that grows
+    as expiry nears and with the cost of the last compute (XFetch). Only the
+    reader that wins an `add()` lock recomputes; everyone else keeps getting
+    the stale value. If the refresh fails with a DatabaseError the stale
+    value is served and the lock is left to expire, which throttles retries.
+    On a cold miss, readers that lose the lock wait up to `wait` seconds for
+    the winner's value before computing it themselves.
+    """
+    grace = timeout if grace is None else grace
+    lock_key = f'{key}:lock'
+    entry = _entry(cache.get(key))
+
+    if entry is not None:
+        # -log(u) for u in (0, 1] is >= 0; a larger delta refreshes earlier
+        early = entry.delta * beta * -math.log(1.0 - random.random())
+        if time.time() + early < entry.expires:
+            return entry.value
+        if not cache.add(lock_key, 1, lock_timeout):
+            return entry.value
+        try:
+            value = _compute_and_store(key, compute, timeout, grace)
+        except DatabaseError:
+            logger.warning('Serving stale %s; refresh failed', key, exc_info=True)
+            return entry.value
+        except Exception:
+            cache.delete(lock_key)
+            raise
+        cache.delete(lock_key)
+        return value
+
+    locked = cache.add(lock_key, 1, lock_timeout)
+    if not locked:
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = _entry(cache.get(key))
+            if entry is not None:
+                return entry.value
+    try:
+        return _compute_and_store(key, compute, timeout, grace)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+def expire(key):
+    """Mark a `get_or_compute` value stale, keeping it for readers during the refresh."""
+    entry = _entry(cache.get(key))
+    if entry is not None:
+        cache.set(key, entry._replace(expires=0), 60)
+
+
+# Keys recorded per namespace generation; fills past this are left to expire
+REGISTRY_MAX_KEYS = 1000
+
+
+def _generation_key(namespace):
+    return f'gen:{namespace}'
+
+
+def _registry_key(namespace, gen):
+    return f'genkeys:{namespace}:{gen}'
+
+
+def generations(namespaces) -> dict:
+    """Current generation number of each namespace."""
+    keys = {_generation_key(ns): ns for ns in namespaces}
+    found = cache.get_many(list(keys))
+    result = {}
+    for key, ns in keys.items():
+        gen = found.get(key)
+        if gen is None:
+            # Seed from the clock rather than 1: a generation lost to culling
+            # must not come back as a number that older keys were built with.
+            cache.add(key, time.time_ns() // 1_000_000, None)
+            gen = cache.get(key)
+        result[ns] = gen
+    return result
+
+
+def generation(namespace) -> int:
+    return generations([namespace])[namespace]
+
+
+def make_key(prefix, namespaces, *parts) -> str:
+    """Build a cache key that is orphaned whenever any of `namespaces` is bumped."""
+    stamp = repr((sorted(generations(namespaces).items()), parts))
+    return f'{prefix}:{hashlib.sha1(stamp.encode()).hexdigest()}'
+
+
+def set_namespaced(key, value, timeout, namespaces):
+    """`cache.set()` a `make_key()` key and record it for orphan cleanup."""
+    cache.set(key, value, timeout)
+    # A registry is a counter plus one slot per recorded key. incr() is
+    # atomic, so concurrent fills don't drop each other's entries, and it
+    # keeps the counter's first timeout: once that lapses the generation's
+    # keys are left to expire on their own instead of being purged.
+    for ns, gen in generations(namespaces).items():
+        registry = _registry_key(ns, gen)
+        cache.add(registry, 0, timeout)
+        try:
+            slot = cache.incr(registry)
+        except ValueError:
+            continue
+        if slot <= REGISTRY_MAX_KEYS:
+            cache.set(f'{registry}:{slot}', key, timeout)
+
+
+def bump_generation(*namespaces):
+    """Orphan every key built from the current generation of `namespaces`."""
+    for ns in namespaces:
+        key = _generation_key(ns)
+        try:
+            gen = cache.incr(key)
+        except ValueError:
+            # Never read, so no keys were built from it
+            continue
+        _purger.submit(ns, gen - 1)
+
+
+def purge_generation(namespace, gen) -> int:
+    """Delete the keys recorded under one generation; returns how many."""
+    registry = _registry_key(namespace, gen)
+    count = cache.get(registry)
+    if count is None:
+        return 0
+    slots = [f'{registry}:{slot}' for slot in range(1, min(count, REGISTRY_MAX_KEYS) + 1)]
+    keys = list(cache.get_many(slots).values())
+    cache.delete_many([*keys, *slots, registry])
+    return len(keys)
+
+
+def purge_orphans(namespace, depth=10) -> int:
+    """Purge keys left under the `depth` generations before the current one.
+
+    Catches up on purges the background thread never ran, e.g. because the
+    process exited first.
+    """
+    gen = cache.get(_generation_key(namespace))
+    if gen is None:
+        return 0
+    return sum(purge_generation(namespace, old) for old in range(gen - depth, gen))
+
+
+class _Purger:
+    """Deletes orphaned keys on a daemon thread, off the request path."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, namespace, gen):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='cache-purger', daemon=True)
+                self._thread.start()
+        self.queue.put((namespace, gen))
+
+    def _run(self):
+        while True:
+            namespace, gen = self.queue.get()
+            try:
+                purge_generation(namespace, gen)
+            except Exception:
+                logger.warning('Purging %s generation %s failed', namespace, gen, exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    def wait(self):
+        """Block until queued purges are done."""
+        self.queue.join()
+
+
+_purger = _Purger()
+wait_for_purges = _purger.wait
@@ -0,0 +1,414 @@
+import fcntl
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+from .cache import LRUCache
+
+_COUNTER = struct.Struct('<Q')
+
+
+class GenerationTable:
+    """Cross-process counters stored in a small file of 8-byte slots.
+
+    Reads go through a shared mmap, so checking a generation costs no
+    syscall; bumps take an exclusive flock on the file.
+    """
+
+    def __init__(self, path, slots):
+        self.path = path
+        self.slots = slots
+        self._fd = None
+        self._map = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._map is None:
+            with self._lock:
+                if self._map is None:
+                    size = _COUNTER.size * self.slots
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                    if os.fstat(fd).st_size < size:
+                        os.ftruncate(fd, size)
+                    self._fd = fd
+                    self._map = mmap.mmap(fd, size)
+        return self._map
+
+    def value(self, slot: int = 0) -> int:
+        return _COUNTER.unpack_from(self._open(), slot * _COUNTER.size)[0]
+
+    def bump(self, *slots) -> list:
+        """Increment each of `slots` (default: slot 0); returns the new values."""
+        counters = self._open()
+        values = []
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                for slot in slots or (0,):
+                    offset = slot * _COUNTER.size
+                    values.append(_COUNTER.unpack_from(counters, offset)[0] + 1)
+                    _COUNTER.pack_into(counters, offset, values[-1])
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return values
+
+
+class TwoTierCache(BaseCache):
+    """Per-process LRU in front of a shared, process-local cache backend.
+
+    Keys hash into GENERATION_BUCKETS buckets, each with a generation counter
+    shared by all workers through a small file. A write (set, add, delete,
+    incr) bumps only its key's bucket, and a memory entry is served only
+    while its bucket's generation is the one it was stored under, so a write
+    in one worker invalidates that key (and the few sharing its bucket) in
+    the others while the rest of their memory tier stays warm. clear() bumps an epoch that covers every bucket.
+    Memory entries also expire after MEMORY_TIMEOUT seconds because entries
+    filled from the shared tier do not know their remaining TTL.
+
+    OPTIONS:
+        SHARED_BACKEND: dotted path of the shared backend (FileBasedCache)
+        SHARED_OPTIONS: OPTIONS passed to the shared backend
+        MEMORY_MAX_ENTRIES: LRU size per process (1000)
+        MEMORY_TIMEOUT: upper bound on memory entry lifetime (30)
+        GENERATION_BUCKETS: invalidation buckets (4096)
+        GENERATION_FILE: counter file (LOCATION/.generation)
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        options = dict(params.get('OPTIONS') or {})
+        shared_backend = options.pop('SHARED_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache')
+        shared_options = options.pop('SHARED_OPTIONS', {})
+        memory_max_entries = options.pop('MEMORY_MAX_ENTRIES', 1000)
+        self.memory_timeout = options.pop('MEMORY_TIMEOUT', 30)
+        self.buckets = int(options.pop('GENERATION_BUCKETS', 4096))
+        generation_file = options.pop('GENERATION_FILE', None) or os.path.join(location, '.generation')
+        super().__init__({**params, 'OPTIONS': options})
+
+        self.shared = import_string(shared_backend)(location, {**params, 'OPTIONS': shared_options})
+        self.memory = LRUCache(memory_max_entries)
+        # Slot 0 is the clear() epoch; slots 1..buckets belong to key buckets
+        self.generation = GenerationTable(generation_file, self.buckets + 1)
+
+    def make_key(self, key, version=None):
+        return self.shared.make_key(key, version)
+
+    def _bucket(self, full_key) -> int:
+        return zlib.crc32(full_key.encode()) % self.buckets + 1
+
+    def _generation(self, full_key):
+        return self.generation.value(0), self.generation.value(self._bucket(full_key))
+
+    def _bump(self, full_keys):
+        """Invalidate `full_keys` in every worker; returns their new generations."""
+        buckets = sorted({self._bucket(full_key) for full_key in full_keys})
+        bumped = dict(zip(buckets, self.generation.bump(*buckets)))
+        epoch = self.generation.value(0)
+        return {full_key: (epoch, bumped[self._bucket(full_key)]) for full_key in full_keys}
+
+    def _remember(self, full_key, value, timeout, generation):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is not None and timeout <= 0:
+            return
+        lifetime = self.memory_timeout if timeout is None else min(timeout, self.memory_timeout)
+        self.memory.set(
+            full_key, (pickle.dumps(value, self.pickle_protocol), time.monotonic() + lifetime, generation)
+        )
+
+    def _recall(self, full_key, generation):
+        entry = self.memory.get(full_key)
+        if entry is None:
+            return None
+        pickled, expires, entry_generation = entry
+        if entry_generation != generation or expires <= time.monotonic():
+            self.memory.delete(full_key)
+            return None
+        return entry
+
+    def get(self, key, default=None, version=None):
+        full_key = self.make_key(key, version)
+        generation = self._generation(full_key)
+        entry = self._recall(full_key, generation)
+        if entry is not None:
+            return pickle.loads(entry[0])
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version)
+        if value is sentinel:
+            return default
+        self._remember(full_key, value, DEFAULT_TIMEOUT, generation)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = {}
+        for key in keys:
+            full_key = self.make_key(key, version)
+            generation = self._generation(full_key)
+            entry = self._recall(full_key, generation)
+            if entry is None:
+                missing[key] = (full_key, generation)
+            else:
+                found[key] = pickle.loads(entry[0])
+        if missing:
+            fetched = self.shared.get_many(list(missing), version)
+            for key, value in fetched.items():
+                full_key, generation = missing[key]
+                self._remember(full_key, value, DEFAULT_TIMEOUT, generation)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        full_key = self.make_key(key, version)
+        if self._recall(full_key, self._generation(full_key)) is not None:
+            return True
+        return self.shared.has_key(key, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_key(key, version)
+        self.shared.set(key, value, timeout, version)
+        self._remember(full_key, value, timeout, self._bump([full_key])[full_key])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version)
+        full_keys = {key: self.make_key(key, version) for key in data}
+        generations = self._bump(list(full_keys.values()))
+        for key, value in data.items():
+            if key not in failed:
+                self._remember(full_keys[key], value, timeout, generations[full_keys[key]])
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            full_key = self.make_key(key, version)
+            self._remember(full_key, value, timeout, self._bump([full_key])[full_key])
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        full_key = self.make_key(key, version)
+        self.memory.delete(full_key)
+        value = self.shared.incr(key, delta, version)
+        self._bump([full_key])
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version)
+
+    def delete(self, key, version=None):
+        full_key = self.make_key(key, version)
+        self.memory.delete(full_key)
+        deleted = self.shared.delete(key, version)
+        self._bump([full_key])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        full_keys = [self.make_key(key, version) for key in keys]
+        for full_key in full_keys:
+            self.memory.delete(full_key)
+        self.shared.delete_many(keys, version)
+        if full_keys:
+            self._bump(full_keys)
+
+    def clear(self):
+        self.memory.clear()
+        self.shared.clear()
+        self.generation.bump(0)
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+class SQLiteCache(BaseCache):
+    """Cache stored in one local SQLite file in WAL mode.
+
+    Expiry lives in an indexed column, so expired rows are swept in batches
+    every SWEEP_INTERVAL writes instead of by listing a directory. Culling
+    past MAX_ENTRIES drops the rows closest to expiry.
+
+    LOCATION is a directory; OPTIONS: FILENAME (cache.sqlite3),
+    SWEEP_INTERVAL (100), SWEEP_BATCH (500), plus MAX_ENTRIES/CULL_FREQUENCY.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+    # Rows per multi-row statement; 3 parameters each stays under SQLite's limit
+    batch_rows = 300
+
+    def __init__(self, location, params):
+        options = dict(params.get('OPTIONS') or {})
+        filename = options.pop('FILENAME', 'cache.sqlite3')
+        self.sweep_interval = int(options.pop('SWEEP_INTERVAL', 100))
+        self.sweep_batch = int(options.pop('SWEEP_BATCH', 500))
+        super().__init__({**params, 'OPTIONS': options})
+        self.path = os.path.join(os.path.abspath(location), filename)
+        self._local = threading.local()
+        self._writes = 0
+
+    @property
+    def _conn(self):
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None or local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)')
+            local.conn = conn
+            local.pid = os.getpid()
+        return conn
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _after_write(self):
+        self._writes += 1
+        if self._writes % self.sweep_interval == 0:
+            self._sweep()
+
+    def _sweep(self):
+        conn = self._conn
+        conn.execute(
+            'DELETE FROM cache WHERE key IN '
+            '(SELECT key FROM cache WHERE expires <= ? LIMIT ?)',
+            (time.time(), self.sweep_batch),
+        )
+        count = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count > self._max_entries:
+            if self._cull_frequency == 0:
+                conn.execute('DELETE FROM cache')
+                return
+            conn.execute(
+                'DELETE FROM cache WHERE key IN '
+                '(SELECT key FROM cache ORDER BY expires IS NULL, expires LIMIT ?)',
+                (count // self._cull_frequency,),
+            )
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._conn.execute(
+            'SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        found = {}
+        names = list(key_map)
+        now = time.time()
+        for i in range(0, len(names), self.batch_rows * 3):
+            chunk = names[i:i + self.batch_rows * 3]
+            rows = self._conn.execute(
+                'SELECT key, value FROM cache WHERE key IN (%s) AND (expires IS NULL OR expires > ?)'
+                % ', '.join('?' * len(chunk)),
+                (*chunk, now),
+            )
+            for full_key, value in rows:
+                found[key_map[full_key]] = pickle.loads(value)
+        return found
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._conn.execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone() is not None
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+            (key, self._dumps(value), self.get_backend_timeout(timeout)),
+        )
+        self._after_write()
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._dumps(value), expires)
+            for key, value in data.items()
+        ]
+        for i in range(0, len(rows), self.batch_rows):
+            chunk = rows[i:i + self.batch_rows]
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires) VALUES %s'
+                % ', '.join(['(?, ?, ?)'] * len(chunk)),
+                [param for row in chunk for param in row],
+            )
+        self._after_write()
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._conn.execute(
+            'INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache.expires IS NOT NULL AND cache.expires <= ?',
+            (key, self._dumps(value), self.get_backend_timeout(timeout), time.time()),
+        )
+        self._after_write()
+        return cursor.rowcount > 0
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._conn.execute(
+            'UPDATE cache SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (full_key, time.time()),
+            ).fetchone()
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            conn.execute('UPDATE cache SET value = ? WHERE key = ?', (self._dumps(value), full_key))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._conn.execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount > 0
+
+    def delete_many(self, keys, version=None):
+        names = [self.make_and_validate_key(key, version=version) for key in keys]
+        for i in range(0, len(names), self.batch_rows * 3):
+            chunk = names[i:i + self.batch_rows * 3]
+            self._conn.execute(
+                'DELETE FROM cache WHERE key IN (%s)' % ', '.join('?' * len(chunk)), chunk
+            )
+
+    def clear(self):
+        self._conn.execute('DELETE FROM cache')
+
+    def close(self, **kwargs):
+        # Connections are per thread and reused across requests
+        pass
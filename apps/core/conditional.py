@@ -0,0 +1,67 @@
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.middleware.csrf import get_token
+from django.views.decorators.http import condition
+
+from .models import PublishedTag
+
+
+def published_signature(queryset):
+    """Latest `updated_at`, row count and total comment count of a Submission queryset.
+
+    One query; the comment total catches listings whose counters moved.
+    """
+    row = queryset.order_by().aggregate(
+        last=Max('updated_at'), count=Count('pk'), comments=Sum('comment_count')
+    )
+    return row['last'], row['count'], row['comments']
+
+
+def tag_catalog_signature():
+    """Changes whenever a tag is added to or removed from a published submission."""
+    row = PublishedTag.objects.aggregate(last=Max('last_used_at'), total=Sum('count'))
+    return row['last'], row['total']
+
+
+def conditional_page(validator, per_user=True):
+    """Answer conditional GETs from `validator` before the view runs.
+
+    `validator(request, *args, **kwargs)` returns `(last_modified, parts)` or
+    None when the view should run unconditionally; `parts` are folded into the
+    ETag. Pages that differ per visitor (`per_user`) also fold in the user and
+    send no Last-Modified to signed-in users, since a login does not change it.
+    For signed-in users the CSRF secret is folded in as well: their pages carry
+    forms, and a 304 after the token rotates would keep a stale token that
+    fails the next POST with 403.
+    """
+
+    def validate(request, *args, **kwargs):
+        # condition() asks for the ETag and Last-Modified separately
+        memo = request.__dict__.setdefault('_conditional_validators', {})
+        if validator not in memo:
+            memo[validator] = validator(request, *args, **kwargs)
+        return memo[validator]
+
+    def etag(request, *args, **kwargs):
+        result = validate(request, *args, **kwargs)
+        if result is None:
+            return None
+        last_modified, parts = result
+        if per_user:
+            user = request.user
+            if user.is_authenticated:
+                # get_token() sets the secret (and its cookie) on a first visit
+                get_token(request)
+                parts = (user.pk, request.META['CSRF_COOKIE'], *parts)
+            else:
+                parts = ('anon', *parts)
+        return hashlib.sha1(repr((last_modified, *parts)).encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        result = validate(request, *args, **kwargs)
+        if result is None or (per_user and request.user.is_authenticated):
+            return None
+        return result[0]
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
@@ -0,0 +1,73 @@
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+BACKENDS = {
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", {"MAX_ENTRIES": 10000}),
+    "sqlite": ("apps.core.cache_backends.SQLiteCache", {"MAX_ENTRIES": 10000}),
+    "two_tier": (
+        "apps.core.cache_backends.TwoTierCache",
+        {"SHARED_OPTIONS": {"MAX_ENTRIES": 10000}, "MEMORY_MAX_ENTRIES": 1000},
+    ),
+    "two_tier_sqlite": (
+        "apps.core.cache_backends.TwoTierCache",
+        {
+            "SHARED_BACKEND": "apps.core.cache_backends.SQLiteCache",
+            "SHARED_OPTIONS": {"MAX_ENTRIES": 10000},
+            "MEMORY_MAX_ENTRIES": 1000,
+        },
+    ),
+}
+
+
+def _rate(count, seconds):
+    return round(count / seconds) if seconds else 0
+
+
+class Command(BaseCommand):
+    help = "Compare cache backends on set/get/get_many throughput with site-like values."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keys", type=int, default=500, help="Distinct keys written")
+        parser.add_argument("--reads", type=int, default=10, help="Read passes over the keys")
+        parser.add_argument("--only", nargs="*", default=None, choices=sorted(BACKENDS))
+
+    def handle(self, *args, **opts):
+        keys = [f"bench:{i}" for i in range(max(1, opts["keys"]))]
+        value = "<p>" + "rendered markdown " * 200 + "</p>"
+        reads = max(1, opts["reads"])
+
+        self.stdout.write(f"{'backend':<16}{'set/s':>10}{'get hit/s':>12}{'get miss/s':>12}{'get_many/s':>12}")
+        for name, (path, options) in BACKENDS.items():
+            if opts["only"] and name not in opts["only"]:
+                continue
+            with tempfile.TemporaryDirectory() as location:
+                backend = import_string(path)(location, {"TIMEOUT": 300, "OPTIONS": options})
+
+                start = time.perf_counter()
+                for key in keys:
+                    backend.set(key, value)
+                set_rate = _rate(len(keys), time.perf_counter() - start)
+
+                start = time.perf_counter()
+                for _ in range(reads):
+                    for key in keys:
+                        backend.get(key)
+                hit_rate = _rate(len(keys) * reads, time.perf_counter() - start)
+
+                start = time.perf_counter()
+                for key in keys:
+                    backend.get(key + ":missing")
+                miss_rate = _rate(len(keys), time.perf_counter() - start)
+
+                batches = [keys[i:i + 20] for i in range(0, len(keys), 20)]
+                start = time.perf_counter()
+                for _ in range(reads):
+                    for batch in batches:
+                        backend.get_many(batch)
+                many_rate = _rate(len(batches) * reads, time.perf_counter() - start)
+                backend.close()
+
+            self.stdout.write(f"{name:<16}{set_rate:>10}{hit_rate:>12}{miss_rate:>12}{many_rate:>12}")
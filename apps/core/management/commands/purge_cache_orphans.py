@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.core.cache import purge_orphans
+from apps.core.models import PublishedTag
+from apps.submissions.models import Submission
+
+
+class Command(BaseCommand):
+    help = "Delete cache entries orphaned by generation bumps that the background purger missed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--depth", type=int, default=10, help="Past generations to check per namespace"
+        )
+
+    def handle(self, *args, **opts):
+        depth = max(1, int(opts["depth"]))
+        usernames = (
+            get_user_model()
+            .objects.filter(submission__isnull=False)
+            .distinct()
+            .values_list("username", flat=True)
+        )
+        namespaces = [
+            "published",
+            "tags",
+            *(f"tag:{slug}" for slug in PublishedTag.objects.values_list("slug", flat=True)),
+            *(f"user:{username}" for username in usernames),
+            *(f"submission:{slug}" for slug in Submission.objects.values_list("slug", flat=True)),
+        ]
+        purged = sum(purge_orphans(namespace, depth) for namespace in namespaces)
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {purged} orphaned keys across {len(namespaces)} namespaces.")
+        )
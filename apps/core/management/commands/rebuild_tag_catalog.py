@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.models import PublishedTag
+
+
+class Command(BaseCommand):
+    help = "Recount tag use over published submissions and fix the tag catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true", help="Only report mismatches; exit non-zero if any"
+        )
+
+    def handle(self, *args, **opts):
+        if opts["check"]:
+            mismatches = PublishedTag.objects.diff()
+            for slug, stored, counted in mismatches:
+                self.stdout.write(f"{slug}: catalog {stored}, recount {counted}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} tag counts differ from a full recount.")
+            self.stdout.write(self.style.SUCCESS("Tag catalog matches a full recount."))
+            return
+
+        fixed = PublishedTag.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt tag catalog ({fixed} rows fixed)."))
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.comments.models import Comment
+from apps.core.cache import bump_generation
+from apps.core.models import AuthorStats
+from apps.core.query_cache import bump_table
+from apps.core.signals import submission_namespaces
+from apps.submissions.models import Submission
+
+
+def visible_comment_counts():
+    """Subquery: comments not soft-deleted, per outer submission."""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(submission=OuterRef("pk"), is_deleted=False)
+            .order_by()
+            .values("submission")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        Value(0),
+    )
+
+
+class Command(BaseCommand):
+    help = "Recount per-submission comment counts and per-author published counts, fixing drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true", help="Only report mismatches; exit non-zero if any"
+        )
+
+    def handle(self, *args, **opts):
+        drifted = (
+            Submission.objects.annotate(actual=visible_comment_counts())
+            .exclude(comment_count=F("actual"))
+            .values_list("slug", "comment_count", "actual")
+        )
+        comment_mismatches = list(drifted)
+        author_mismatches = AuthorStats.objects.diff()
+
+        if opts["check"]:
+            for slug, stored, counted in comment_mismatches:
+                self.stdout.write(f"submission {slug}: comment_count {stored}, recount {counted}")
+            for user_id, stored, counted in author_mismatches:
+                self.stdout.write(f"user {user_id}: published_count {stored}, recount {counted}")
+            total = len(comment_mismatches) + len(author_mismatches)
+            if total:
+                raise CommandError(f"{total} counters differ from a full recount.")
+            self.stdout.write(self.style.SUCCESS("Counters match a full recount."))
+            return
+
+        if comment_mismatches:
+            fixed = Submission.objects.filter(slug__in=[slug for slug, _, _ in comment_mismatches])
+            fixed.update(comment_count=visible_comment_counts())
+            # Bulk updates send no signals; listings show these counts
+            bump_table(Submission)
+            namespaces = set()
+            for submission in fixed.select_related("user"):
+                namespaces.update(submission_namespaces(submission))
+            bump_generation(*namespaces)
+        fixed_authors = AuthorStats.objects.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recounted: {len(comment_mismatches)} submissions, {fixed_authors} authors fixed."
+            )
+        )
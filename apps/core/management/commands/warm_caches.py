@@ -0,0 +1,102 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from apps.core.utils import get_tag_items
+from apps.submissions.models import Submission
+
+
+def warm_host():
+    """A host name the site accepts, for the internal anonymous requests."""
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip(".")
+        if host and host != "*":
+            return host
+    return "localhost"
+
+
+class Command(BaseCommand):
+    help = "Precompute the tag catalog, stored HTML and anonymous pages after a deploy or cache wipe."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=50, help="Most recent submissions to warm")
+        parser.add_argument("--workers", type=int, default=4, help="Parallel warming threads")
+
+    def handle(self, *args, **opts):
+        limit = max(0, int(opts["limit"]))
+        workers = max(1, int(opts["workers"]))
+        host = warm_host()
+
+        tasks = [("tag catalog", self._warm_tags)]
+        for url in (reverse("home"), reverse("rss"), reverse("sitemap")):
+            tasks.append((url, self._get_page(url, host)))
+        recent = Submission.objects.filter(status="published").order_by("-created_at")[:limit]
+        for submission in recent.only("pk", "slug", "html_version"):
+            tasks.append((submission.get_absolute_url(), self._warm_submission(submission, host)))
+
+        started = time.perf_counter()
+        failed = 0
+        for done, (label, (elapsed, error)) in enumerate(self._run(tasks, workers), start=1):
+            if error:
+                failed += 1
+                self.stderr.write(f"[{done}/{len(tasks)}] {label}: {error}")
+            else:
+                self.stdout.write(f"[{done}/{len(tasks)}] {label} {elapsed * 1000:.1f} ms")
+
+        total = time.perf_counter() - started
+        summary = f"Warmed {len(tasks) - failed}/{len(tasks)} entries in {total:.2f}s ({workers} workers)."
+        if failed:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def _run(self, tasks, workers):
+        """Yield `(label, (seconds, error))` as tasks finish."""
+        if workers == 1:
+            for label, task in tasks:
+                yield label, self._timed(task)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._timed, task, True): label for label, task in tasks}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _timed(self, task, own_thread=False):
+        start = time.perf_counter()
+        try:
+            task()
+        except Exception as exc:  # reported per task; one failure does not stop the run
+            return time.perf_counter() - start, exc
+        finally:
+            if own_thread:
+                # Pool threads open their own database connections
+                connections.close_all()
+        return time.perf_counter() - start, None
+
+    def _warm_tags(self):
+        get_tag_items()
+
+    def _get_page(self, url, host):
+        def fetch():
+            # Anonymous requests through the full stack fill the page cache
+            response = Client(HTTP_HOST=host).get(url, secure=True)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+
+        return fetch
+
+    def _warm_submission(self, submission, host):
+        fetch = self._get_page(submission.get_absolute_url(), host)
+
+        def warm():
+            # Stored HTML may be stale even when the page is already cached
+            if submission.html_is_stale:
+                Submission.objects.get(pk=submission.pk).refresh_html()
+            fetch()
+
+        return warm
@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def populate(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Submission = apps.get_model("submissions", "Submission")
+    TaggedItem = apps.get_model("taggit", "TaggedItem")
+    PublishedTag = apps.get_model("core", "PublishedTag")
+    content_type = ContentType.objects.filter(app_label="submissions", model="submission").first()
+    if content_type is None:
+        return
+    published = dict(Submission.objects.filter(status="published").values_list("pk", "created_at"))
+    rows = [
+        (published[pk], pk, name)
+        for name, pk in TaggedItem.objects.filter(content_type=content_type).values_list(
+            "tag__name", "object_id"
+        )
+        if pk in published
+    ]
+    counted = {}
+    # Newest first, so the first row of each slug carries its latest use
+    for created_at, pk, name in sorted(rows, reverse=True):
+        slug = slugify(name) if name else ""
+        if slug:
+            counted.setdefault(slug, [name, set(), created_at])[1].add(pk)
+    PublishedTag.objects.bulk_create(
+        PublishedTag(slug=slug, name=name, count=len(pks), last_used_at=last)
+        for slug, (name, pks, last) in counted.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0001_initial"),
+        ("submissions", "0020_store_rendered_html"),
+        ("taggit", "0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def populate(apps, schema_editor):
+    AuthorStats = apps.get_model("core", "AuthorStats")
+    Submission = apps.get_model("submissions", "Submission")
+    rows = (
+        Submission.objects.filter(status="published", user__isnull=False)
+        .order_by()
+        .values_list("user_id")
+        .annotate(count=Count("pk"))
+    )
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(user_id=user_id, published_count=count) for user_id, count in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("core", "0002_populate_published_tag"),
+        ("submissions", "0021_submission_comment_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthorStats",
+            fields=[
+                ("user", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="author_stats", serialize=False, to=settings.AUTH_USER_MODEL)),
+                ("published_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "author stats",
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,238 @@
+import copy
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .cache import bump_generation
+
+
+class DirtyFieldsMixin:
+    """Track which concrete fields changed since the instance was loaded or saved.
+
+    Subclasses call `_snapshot()` after writing; `get_dirty_fields()` returns
+    field names whose current value differs from the snapshot.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def _snapshot(self, fields=None):
+        state = self.__dict__
+        if fields is None or '_loaded_values' not in state:
+            state['_loaded_values'] = {}
+        loaded = state['_loaded_values']
+        for field in self._meta.concrete_fields:
+            if fields is not None and field.name not in fields and field.attname not in fields:
+                continue
+            if field.attname in state:
+                loaded[field.attname] = copy.deepcopy(state[field.attname])
+
+    @property
+    def tracks_changes(self) -> bool:
+        return not self._state.adding and '_loaded_values' in self.__dict__
+
+    def get_dirty_fields(self) -> set:
+        if not self.tracks_changes:
+            return {field.name for field in self._meta.concrete_fields if not field.primary_key}
+        state = self.__dict__
+        loaded = state['_loaded_values']
+        missing = object()
+        return {
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in state and state[field.attname] != loaded.get(field.attname, missing)
+        }
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot(fields)
+
+    def previous_values(self, fields) -> dict:
+        """Snapshot values of `fields`, for fields that were tracked."""
+        loaded = self.__dict__.get('_loaded_values', {})
+        values = {}
+        for name in fields:
+            attname = self._meta.get_field(name).attname
+            if attname in loaded:
+                values[name] = loaded[attname]
+        return values
+
+
+def _slug_names(names) -> dict:
+    """Map slug to the first display name that produces it."""
+    slugs = {}
+    for name in names:
+        slug = slugify(name) if name else ''
+        if slug:
+            slugs.setdefault(slug, name)
+    return slugs
+
+
+class PublishedTagManager(models.Manager):
+    def increment(self, names):
+        """Count one more published submission for each tag in `names`."""
+        slugs = _slug_names(names)
+        if not slugs:
+            return
+        with transaction.atomic():
+            self.bulk_create(
+                [self.model(slug=slug, name=name) for slug, name in slugs.items()],
+                ignore_conflicts=True,
+            )
+            self.filter(slug__in=slugs).update(count=F('count') + 1, last_used_at=timezone.now())
+
+    def decrement(self, names):
+        """Count one fewer published submission for each tag in `names`."""
+        slugs = _slug_names(names)
+        if not slugs:
+            return
+        self.filter(slug__in=slugs, count__gt=0).update(count=F('count') - 1)
+
+    def recount(self) -> dict:
+        """Count tag use over all published submissions: slug -> (name, count, last_used_at)."""
+        from apps.submissions.models import Submission
+
+        rows = (
+            Submission.objects.filter(status='published', tags__isnull=False)
+            .order_by('-created_at')
+            .values_list('tags__name', 'pk', 'created_at')
+        )
+        counted = {}
+        for name, pk, created_at in rows:
+            slug = slugify(name) if name else ''
+            if not slug:
+                continue
+            # Rows come newest first, so the first one carries the latest use
+            entry = counted.setdefault(slug, [name, set(), created_at])
+            entry[1].add(pk)
+        return {slug: (name, len(pks), last) for slug, (name, pks, last) in counted.items()}
+
+    def diff(self, counts=None) -> list:
+        """Return `(slug, stored count, recounted count)` for every mismatch."""
+        counts = self.recount() if counts is None else counts
+        stored = dict(self.values_list('slug', 'count'))
+        return [
+            (slug, stored.get(slug, 0), counts.get(slug, (None, 0))[1])
+            for slug in sorted(set(stored) | set(counts))
+            if stored.get(slug, 0) != counts.get(slug, (None, 0))[1]
+        ]
+
+    def rebuild(self) -> int:
+        """Make the catalog match a full recount; returns the number of rows fixed."""
+        counts = self.recount()
+        with transaction.atomic():
+            mismatches = self.diff(counts)
+            self.exclude(slug__in=counts).update(count=0)
+            existing = {tag.slug: tag for tag in self.filter(slug__in=counts)}
+            for slug, (name, count, last_used_at) in counts.items():
+                tag = existing.get(slug)
+                if tag is None:
+                    self.create(slug=slug, name=name, count=count, last_used_at=last_used_at)
+                elif tag.count != count or not tag.last_used_at or tag.last_used_at < last_used_at:
+                    tag.count = count
+                    tag.last_used_at = max(filter(None, (tag.last_used_at, last_used_at)))
+                    tag.save(update_fields=['count', 'last_used_at'])
+        # increment() and decrement() run from receivers that bump 'tags' themselves
+        transaction.on_commit(lambda: bump_generation('tags'))
+        return len(mismatches)
+
+
+class PublishedTag(models.Model):
+    """Materialized catalog of tags on published submissions.
+
+    Kept current by the receivers in `apps.core.signals`; `rebuild_tag_catalog`
+    checks it against a full recount.
+    """
+
+    slug = models.SlugField(max_length=100, unique=True)
+    name = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    objects = PublishedTagManager()
+
+    class Meta:
+        ordering = ['-last_used_at', 'name']
+
+    def __str__(self):
+        return f'{self.name} ({self.count})'
+
+
+class AuthorStatsManager(models.Manager):
+    def increment(self, user_id):
+        """Count one more published submission for `user_id`."""
+        if not user_id:
+            return
+        with transaction.atomic():
+            self.bulk_create([self.model(user_id=user_id)], ignore_conflicts=True)
+            self.filter(user_id=user_id).update(published_count=F('published_count') + 1)
+
+    def decrement(self, user_id):
+        """Count one fewer published submission for `user_id`."""
+        if user_id:
+            self.filter(user_id=user_id, published_count__gt=0).update(
+                published_count=F('published_count') - 1
+            )
+
+    def has_published(self, user) -> bool:
+        return self.filter(user_id=user.pk, published_count__gt=0).exists()
+
+    def recount(self) -> dict:
+        """Published submissions per author: user id -> count."""
+        from apps.submissions.models import Submission
+
+        rows = (
+            Submission.objects.filter(status='published', user__isnull=False)
+            .order_by()
+            .values_list('user_id')
+            .annotate(count=models.Count('pk'))
+        )
+        return dict(rows)
+
+    def diff(self, counts=None) -> list:
+        """Return `(user id, stored count, recounted count)` for every mismatch."""
+        counts = self.recount() if counts is None else counts
+        stored = dict(self.values_list('user_id', 'published_count'))
+        return [
+            (user_id, stored.get(user_id, 0), counts.get(user_id, 0))
+            for user_id in sorted(set(stored) | set(counts))
+            if stored.get(user_id, 0) != counts.get(user_id, 0)
+        ]
+
+    def rebuild(self) -> int:
+        """Make the counters match a full recount; returns the number of rows fixed."""
+        counts = self.recount()
+        with transaction.atomic():
+            mismatches = self.diff(counts)
+            for user_id, _, count in mismatches:
+                self.update_or_create(user_id=user_id, defaults={'published_count': count})
+        return len(mismatches)
+
+
+class AuthorStats(models.Model):
+    """Denormalized per-user counters, kept current by `apps.core.signals`.
+
+    `manage.py recount` checks them against the submissions table.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='author_stats',
+    )
+    published_count = models.PositiveIntegerField(default=0)
+
+    objects = AuthorStatsManager()
+
+    class Meta:
+        verbose_name_plural = 'author stats'
+
+    def __str__(self):
+        return f'{self.user_id}: {self.published_count} published'
@@ -0,0 +1,91 @@
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .cache import make_key, set_namespaced
+
+CACHE_HEADER = 'X-Page-Cache'
+
+
+def page_cache_timeout() -> int:
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', 600)
+
+
+def is_cacheable_request(request) -> bool:
+    """Only anonymous GETs without session or flash-message state are cached."""
+    if request.method not in ('GET', 'HEAD') or not page_cache_timeout():
+        return False
+    cookies = request.COOKIES
+    if settings.SESSION_COOKIE_NAME in cookies or CookieStorage.cookie_name in cookies:
+        return False
+    return not request.user.is_authenticated
+
+
+def serve_page(request, render, namespaces):
+    """Return the cached page for `request`, or call `render()` and cache its result.
+
+    The key is built from the path and the current generation of each of
+    `namespaces`, so `bump_generation()` on any of them orphans the page.
+    """
+    if not is_cacheable_request(request):
+        return render()
+
+    # Generations are read before rendering: a bump that lands mid-render
+    # orphans this entry instead of pinning a stale page under the new one.
+    key = make_key('page', namespaces, request.get_full_path())
+    cached = cache.get(key)
+    if cached is not None:
+        content, headers = cached
+        response = HttpResponse(content, headers=headers)
+        response[CACHE_HEADER] = 'HIT'
+        return response
+
+    def store(response):
+        # A response that sets cookies (e.g. a fresh CSRF token) is per-visitor
+        if response.cookies or request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            return
+        headers = {name: value for name, value in response.items() if name != CACHE_HEADER}
+        set_namespaced(key, (response.content, headers), page_cache_timeout(), namespaces)
+
+    response = render()
+    response[CACHE_HEADER] = 'MISS'
+    if response.status_code == 200 and not response.streaming:
+        if getattr(response, 'is_rendered', True):
+            store(response)
+        else:
+            response.add_post_render_callback(store)
+    return response
+
+
+def cache_page_view(*namespaces):
+    """Page-cache decorator for function views whose pages depend on fixed namespaces."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            return serve_page(request, lambda: view(request, *args, **kwargs), namespaces)
+
+        return wrapped
+
+    return decorator
+
+
+class CachedPageMixin:
+    """Serve anonymous GETs of a TemplateView from the page cache.
+
+    Views list the cache namespaces a page depends on in
+    `page_cache_namespaces()`; it runs before the view, from `self.kwargs`.
+    """
+
+    def page_cache_namespaces(self):
+        return []
+
+    def dispatch(self, request, *args, **kwargs):
+        return serve_page(
+            request,
+            lambda: super(CachedPageMixin, self).dispatch(request, *args, **kwargs),
+            self.page_cache_namespaces(),
+        )
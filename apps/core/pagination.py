@@ -0,0 +1,135 @@
+import base64
+from datetime import datetime
+from functools import cached_property
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+
+from .query_cache import cached_count, cached_rows
+
+PER_PAGE = 20
+# Newest first; the pk breaks ties between equal timestamps
+ORDERING = ('-created_at', '-pk')
+# Largest value a database integer column (and SQLite parameter) holds
+MAX_PK = 2 ** 63 - 1
+
+
+def encode_cursor(created_at, pk) -> str:
+    raw = f'{created_at.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """Return `(created_at, pk)`; raises ValueError for anything we did not issue.
+
+    That includes a pk the database could not bind and a timestamp without
+    a timezone, which would be compared as naive local time.
+    """
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    created_at, pk = raw.rsplit('|', 1)
+    created_at, pk = datetime.fromisoformat(created_at), int(pk)
+    if created_at.utcoffset() is None:
+        raise ValueError('Cursor timestamp has no timezone')
+    if not 0 < pk <= MAX_PK:
+        raise ValueError('Cursor pk out of range')
+    return created_at, pk
+
+
+class KeysetPage:
+    """One page of a newest-first listing, addressed by `(created_at, id)` cursors.
+
+    `next_cursor` and `previous_cursor` go in `?after=` and `?before=`.
+    Unlike Paginator pages there is no page number or exact page count.
+    `cursor` is the `(created_at, pk)` the page was requested after, if any.
+    """
+
+    def __init__(self, object_list, queryset, has_next, has_previous, cursor=None):
+        self.object_list = object_list
+        self.queryset = queryset
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.cursor = cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if self.has_next:
+            last = self.object_list[-1]
+            return encode_cursor(last.created_at, last.pk)
+        return None
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        if self.object_list:
+            first = self.object_list[0]
+            return encode_cursor(first.created_at, first.pk)
+        # Paged past the end (rows deleted since): go back to the last page
+        return encode_cursor(*self.cursor)
+
+    @cached_property
+    def total(self):
+        """Size of the whole listing from the query cache, or None when disabled.
+
+        It can trail writes by the query cache's invalidation, which is fine
+        for a "N posts" label and saves a COUNT over the join on most views.
+        """
+        if not getattr(settings, 'LISTING_SHOW_TOTAL', True):
+            return None
+        return cached_count(self.queryset)
+
+
+def keyset_page(queryset, fields, params, per_page=PER_PAGE) -> KeysetPage:
+    """The page of `queryset` that `params` (request.GET) points at.
+
+    `?after=<cursor>` pages forward, `?before=<cursor>` back; rows come from
+    `cached_rows()` with only `fields` loaded. An invalid cursor is a 404.
+    """
+    after, before = params.get('after'), params.get('before')
+    try:
+        cursor = decode_cursor(before or after) if (before or after) else None
+    except ValueError:
+        raise Http404('Invalid page cursor')
+
+    if before:
+        created_at, pk = cursor
+        newer = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+        rows = cached_rows(newer.order_by('created_at', 'pk')[:per_page + 1], fields)
+        if len(rows) > per_page:
+            return KeysetPage(rows[:per_page][::-1], queryset, has_next=True, has_previous=True)
+        # Paging back reached the start: show a full first page instead
+        cursor = None
+
+    ordered = queryset.order_by(*ORDERING)
+    if cursor:
+        created_at, pk = cursor
+        ordered = ordered.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    rows = cached_rows(ordered[:per_page + 1], fields)
+    return KeysetPage(
+        rows[:per_page], queryset,
+        has_next=len(rows) > per_page, has_previous=cursor is not None, cursor=cursor,
+    )
+
+
+def legacy_page_url(base_url, queryset, page, per_page=PER_PAGE) -> str:
+    """Where numbered page `page` of the old Paginator listing starts in cursor space.
+
+    Costs one OFFSET query per old URL; pages past the end go to the start.
+    """
+    try:
+        page = int(page)
+    except (TypeError, ValueError):
+        page = 1
+    if page > 1:
+        offset = (page - 1) * per_page
+        boundary = queryset.order_by(*ORDERING).values_list('created_at', 'pk')[offset - 1:offset]
+        for created_at, pk in boundary:
+            return f'{base_url}?after={encode_cursor(created_at, pk)}'
+    return base_url
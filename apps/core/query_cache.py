@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import bump_generation, make_key, set_namespaced
+
+
+def query_cache_timeout() -> int:
+    return getattr(settings, 'QUERY_CACHE_TIMEOUT', 300)
+
+
+def table_namespace(model) -> str:
+    return f'table:{model._meta.db_table}'
+
+
+def bump_table(model):
+    """Orphan every cached result that read from `model`'s table."""
+    bump_generation(table_namespace(model))
+
+
+def _query_key(prefix, queryset):
+    """Key on the SQL and parameters; namespaces are the tables it reads."""
+    query = queryset.query
+    # Compiling also fills alias_map with every joined table
+    sql, params = query.get_compiler(queryset.db).as_sql()
+    namespaces = sorted({f'table:{join.table_name}' for join in query.alias_map.values()})
+    return make_key(prefix, namespaces, sql, params), namespaces
+
+
+def cached_rows(queryset, fields) -> list:
+    """Evaluate `queryset` for only `fields`, through the cache.
+
+    Rows are stored as tuples keyed by the SQL and its parameters, and come
+    back as model instances with every other field deferred. Entries are
+    versioned by the generation of each table the query reads, which the
+    receivers in `apps.core.signals` bump on writes.
+    """
+    model = queryset.model
+    wanted = {model._meta.get_field(name).attname for name in fields}
+    # from_db() expects values in concrete field order
+    attnames = [f.attname for f in model._meta.concrete_fields if f.attname in wanted]
+    values = queryset.values_list(*attnames)
+    timeout = query_cache_timeout()
+    if timeout:
+        key, namespaces = _query_key('rows', values)
+        rows = cache.get(key)
+        if rows is None:
+            rows = list(values)
+            set_namespaced(key, rows, timeout, namespaces)
+    else:
+        rows = list(values)
+    return [model.from_db(queryset.db, attnames, row) for row in rows]
+
+
+def cached_count(queryset) -> int:
+    timeout = query_cache_timeout()
+    if not timeout:
+        return queryset.count()
+    key, namespaces = _query_key('count', queryset)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        set_namespaced(key, count, timeout, namespaces)
+    return count
+
+
+class CachedListing:
+    """Paginator-friendly view of a queryset whose pages and count are cached."""
+
+    def __init__(self, queryset, fields):
+        self.queryset = queryset
+        self.fields = fields
+
+    @property
+    def ordered(self):
+        return self.queryset.ordered
+
+    def count(self):
+        return cached_count(self.queryset)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return cached_rows(self.queryset[k], self.fields)
+        return cached_rows(self.queryset[k:k + 1], self.fields)[0]
+
+    def __iter__(self):
+        return iter(cached_rows(self.queryset, self.fields))
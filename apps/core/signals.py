@@ -0,0 +1,203 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils.text import slugify
+from taggit.models import Tag, TaggedItem
+
+from apps.comments.models import Comment
+from apps.submissions.models import Submission
+from apps.submissions.signals import submission_changed
+
+from .cache import bump_generation
+from .models import AuthorStats, PublishedTag
+from .query_cache import bump_table
+
+
+@receiver(submission_changed)
+def count_status_change(sender, instance, created, previous=None, **kwargs):
+    # New submissions have no tags yet; they are counted by the m2m receiver
+    if created or not previous or 'status' not in previous:
+        return
+    was_published = previous['status'] == 'published'
+    if was_published == (instance.status == 'published'):
+        return
+    if was_published:
+        PublishedTag.objects.decrement(instance.tags.names())
+    else:
+        PublishedTag.objects.increment(instance.tags.names())
+
+
+@receiver(m2m_changed, sender=Submission.tags.through)
+def count_tag_change(sender, instance, action, model, pk_set, **kwargs):
+    if not isinstance(instance, Submission) or instance.status != 'published':
+        return
+    if action == 'pre_clear':
+        instance._cleared_tag_names = list(instance.tags.names())
+    elif action == 'post_clear':
+        PublishedTag.objects.decrement(getattr(instance, '_cleared_tag_names', ()))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        names = model.objects.filter(pk__in=pk_set).values_list('name', flat=True)
+        if action == 'post_add':
+            PublishedTag.objects.increment(names)
+        else:
+            PublishedTag.objects.decrement(names)
+
+
+@receiver(pre_delete, sender=Submission)
+def count_deleted_submission(sender, instance, **kwargs):
+    if instance.status == 'published':
+        PublishedTag.objects.decrement(instance.tags.names())
+
+
+@receiver(submission_changed)
+def count_author_submission(sender, instance, created, previous=None, **kwargs):
+    if created:
+        was_published, was_user = False, None
+    elif previous and ('status' in previous or 'user' in previous):
+        was_published = previous.get('status', instance.status) == 'published'
+        was_user = previous.get('user', instance.user_id)
+    else:
+        return
+    is_published = instance.status == 'published'
+    if (was_published, was_user) == (is_published, instance.user_id):
+        return
+    if was_published:
+        AuthorStats.objects.decrement(was_user)
+    if is_published:
+        AuthorStats.objects.increment(instance.user_id)
+
+
+@receiver(post_delete, sender=Submission)
+def count_deleted_author_submission(sender, instance, **kwargs):
+    if instance.status == 'published':
+        AuthorStats.objects.decrement(instance.user_id)
+
+
+def comment_count_delta(comment, created) -> int:
+    """How a saved comment changes its submission's visible comment count."""
+    if created:
+        return 0 if comment.is_deleted else 1
+    previous = comment.previous_values(['is_deleted'])
+    if previous.get('is_deleted', comment.is_deleted) == comment.is_deleted:
+        return 0
+    return -1 if comment.is_deleted else 1
+
+
+def adjust_comment_count(submission_id, delta):
+    if delta > 0:
+        Submission.objects.filter(pk=submission_id).update(comment_count=F('comment_count') + delta)
+    elif delta < 0:
+        Submission.objects.filter(pk=submission_id, comment_count__gt=0).update(
+            comment_count=F('comment_count') + delta
+        )
+    # QuerySet.update() sends no signal; cached listings show the count
+    bump_table_on_commit(Submission)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    delta = comment_count_delta(instance, created)
+    if delta:
+        adjust_comment_count(instance.submission_id, delta)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if not instance.is_deleted:
+        adjust_comment_count(instance.submission_id, -1)
+
+
+def bump_on_commit(*namespaces):
+    """Bump `namespaces` once the write commits, so no reader refills from old rows."""
+    transaction.on_commit(lambda: bump_generation(*namespaces))
+
+
+def bump_table_on_commit(model):
+    transaction.on_commit(lambda: bump_table(model))
+
+
+def tag_namespaces(names):
+    return [f'tag:{slugify(name)}' for name in names if name]
+
+
+def submission_namespaces(submission):
+    """Cache namespaces of everything that lists or shows `submission`."""
+    namespaces = [
+        'published',
+        f'submission:{submission.slug}',
+        *tag_namespaces(submission.tags.names()),
+    ]
+    if submission.user_id:
+        namespaces.append(f'user:{submission.user.username}')
+    return namespaces
+
+
+@receiver(post_save, sender=Submission)
+def bump_submission_generations(sender, instance, created, update_fields, **kwargs):
+    status_changed = created or update_fields is None or 'status' in update_fields
+    # Drafts appear on no cached page unless they were just unpublished
+    if instance.status != 'published' and not status_changed:
+        return
+    namespaces = submission_namespaces(instance)
+    if status_changed:
+        namespaces.append('tags')
+    bump_on_commit(*namespaces)
+
+
+@receiver(pre_delete, sender=Submission)
+def collect_submission_namespaces(sender, instance, **kwargs):
+    # Tags are gone by post_delete, so resolve the namespaces while they exist
+    instance._cache_namespaces = submission_namespaces(instance) + ['tags']
+
+
+@receiver(post_delete, sender=Submission)
+def bump_deleted_submission_generations(sender, instance, **kwargs):
+    bump_on_commit(*getattr(instance, '_cache_namespaces', ()))
+
+
+@receiver(m2m_changed, sender=Submission.tags.through)
+def bump_tag_generations(sender, instance, action, model, pk_set, **kwargs):
+    if not isinstance(instance, Submission) or instance.status != 'published':
+        return
+    if action == 'pre_clear':
+        names = instance.tags.names()
+    elif action in ('post_add', 'post_remove') and pk_set:
+        names = model.objects.filter(pk__in=pk_set).values_list('name', flat=True)
+    else:
+        return
+    bump_on_commit(*submission_namespaces(instance), *tag_namespaces(names), 'tags')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_generation(sender, instance, created=False, **kwargs):
+    if kwargs['signal'] is post_delete:
+        count_changed = not instance.is_deleted
+    else:
+        count_changed = bool(comment_count_delta(instance, created))
+    if count_changed:
+        # Listings show the comment count, so they go stale along with the thread
+        submission = Submission.objects.filter(pk=instance.submission_id).first()
+        if submission and submission.status == 'published':
+            bump_on_commit(*submission_namespaces(submission))
+            return
+    slug = (
+        Submission.objects.filter(pk=instance.submission_id)
+        .values_list('slug', flat=True)
+        .first()
+    )
+    if slug:
+        bump_on_commit(f'submission:{slug}')
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def bump_table_generation(sender, **kwargs):
+    # taggit adds and removes TaggedItem rows one by one, so tag edits land
+    # here too. QuerySet.update() sends no signal: call bump_table() after it.
+    bump_table_on_commit(sender)
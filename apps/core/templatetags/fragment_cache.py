@@ -0,0 +1,56 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache import make_key, set_namespaced
+
+register = template.Library()
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, namespace, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.namespace = namespace
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 600)
+        if not timeout:
+            return self.nodelist.render(context)
+        namespaces = [self.namespace.resolve(context)]
+        vary = [str(var.resolve(context)) for var in self.vary_on]
+        key = make_key('fragment', namespaces, self.name.resolve(context), *vary)
+        html = cache.get(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            set_namespaced(key, html, timeout, namespaces)
+        return html
+
+
+@register.tag
+def fragment_cache(parser, token):
+    """Cache a template fragment until its cache namespace is bumped.
+
+    Usage::
+
+        {% load fragment_cache %}
+        {% fragment_cache "tag_nav" "tags" active_tag %}
+          ...
+        {% endfragment_cache %}
+
+    The first argument names the fragment, the second is the namespace whose
+    generation versions it; any further arguments are values it varies on.
+    Keep per-user output outside the block: one copy serves every visitor.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a name and a namespace")
+    nodelist = parser.parse(('endfragment_cache',))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+        [parser.compile_filter(bit) for bit in bits[3:]],
+    )
@@ -0,0 +1,23 @@
+"""Helpers shared by the test suites."""
+from apps.submissions.models import Submission
+
+# Per-process cache for tests that clear or inspect cache entries
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+SUBMISSION_DEFAULTS = {
+    "project_name": "Project",
+    "tagline": "t",
+    "idea": "idea",
+    "tech": "tech",
+    "failure": "fail",
+    "lessons": "lessons",
+    "status": "published",
+}
+
+
+def make_submission(tags=(), **fields):
+    """Create a published submission with filler text; `fields` override it."""
+    submission = Submission.objects.create(**{**SUBMISSION_DEFAULTS, **fields})
+    if tags:
+        submission.tags.set(list(tags))
+    return submission
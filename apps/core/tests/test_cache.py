@@ -0,0 +1,277 @@
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.cache import (
+    CacheEntry,
+    LRUCache,
+    bump_generation,
+    expire,
+    generation,
+    get_or_compute,
+    make_key,
+    purge_orphans,
+    set_namespaced,
+    wait_for_purges,
+)
+from apps.core.cache_backends import SQLiteCache, TwoTierCache
+from apps.core.testing import LOCMEM_CACHE
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(maxsize=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        self.assertIn("a", lru)
+        self.assertNotIn("b", lru)
+        self.assertIn("c", lru)
+
+    def test_counts_hits_and_misses(self):
+        lru = LRUCache()
+        lru.set("a", 1)
+        self.assertEqual(lru.get("a"), 1)
+        self.assertIsNone(lru.get("missing"))
+        self.assertEqual((lru.hits, lru.misses), (1, 1))
+
+
+class TwoTierCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        params = {"TIMEOUT": 300, "OPTIONS": {"MEMORY_MAX_ENTRIES": 10}}
+        # Two instances over one location stand in for two gunicorn workers
+        self.worker_a = TwoTierCache(tmp.name, params)
+        self.worker_b = TwoTierCache(tmp.name, params)
+
+    def test_get_is_served_from_memory_after_first_read(self):
+        self.worker_a.set("k", {"v": 1})
+        self.assertEqual(self.worker_b.get("k"), {"v": 1})
+        with patch.object(self.worker_b.shared, "get") as shared_get:
+            self.assertEqual(self.worker_b.get("k"), {"v": 1})
+        shared_get.assert_not_called()
+
+    def test_write_in_one_worker_invalidates_memory_in_others(self):
+        self.worker_a.set("k", "old")
+        self.assertEqual(self.worker_b.get("k"), "old")
+        self.worker_a.set("k", "new")
+        self.assertEqual(self.worker_b.get("k"), "new")
+        self.worker_a.delete("k")
+        self.assertIsNone(self.worker_b.get("k"))
+
+    def test_write_keeps_other_keys_in_memory(self):
+        self.worker_a.set("a", 1)
+        self.worker_a.set("b", 2)
+        bucket = self.worker_a._bucket
+        self.assertNotEqual(bucket(self.worker_a.make_key("a")), bucket(self.worker_a.make_key("b")))
+        self.assertEqual(self.worker_b.get("b"), 2)
+        self.worker_a.set("a", 3)
+        self.worker_a.delete("c")
+        with patch.object(self.worker_b.shared, "get") as shared_get:
+            self.assertEqual(self.worker_b.get("b"), 2)
+        shared_get.assert_not_called()
+
+    def test_clear_invalidates_every_worker(self):
+        self.worker_a.set("k", 1)
+        self.assertEqual(self.worker_b.get("k"), 1)
+        self.worker_a.clear()
+        self.assertIsNone(self.worker_b.get("k"))
+
+    def test_returned_values_are_copies(self):
+        self.worker_a.set("k", ["a"])
+        self.worker_a.get("k").append("b")
+        self.assertEqual(self.worker_a.get("k"), ["a"])
+
+    def test_get_many_and_incr(self):
+        self.worker_a.set_many({"a": 1, "b": 2})
+        self.assertEqual(self.worker_b.get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        self.assertEqual(self.worker_a.incr("a"), 2)
+        self.assertEqual(self.worker_b.get("a"), 2)
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = SQLiteCache(
+            tmp.name,
+            {"TIMEOUT": 300, "OPTIONS": {"MAX_ENTRIES": 10, "CULL_FREQUENCY": 2, "SWEEP_INTERVAL": 5}},
+        )
+
+    def test_set_get_delete(self):
+        self.cache.set("k", {"v": 1})
+        self.assertEqual(self.cache.get("k"), {"v": 1})
+        self.assertTrue(self.cache.has_key("k"))
+        self.assertTrue(self.cache.delete("k"))
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_expired_entries_are_misses_and_swept(self):
+        self.cache.set("old", 1, timeout=-1)
+        self.assertIsNone(self.cache.get("old"))
+        self.assertTrue(self.cache.add("old", 2))
+        self.assertEqual(self.cache.get("old"), 2)
+        self.assertFalse(self.cache.add("old", 3))
+        self.cache.set("gone", 1, timeout=-1)
+        self.cache._sweep()
+        rows = self.cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        self.assertEqual(rows, 1)
+
+    def test_many_operations(self):
+        self.cache.set_many({"a": 1, "b": 2})
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        self.cache.delete_many(["a"])
+        self.assertEqual(self.cache.get_many(["a", "b"]), {"b": 2})
+
+    def test_incr_and_touch(self):
+        self.cache.set("n", 1)
+        self.assertEqual(self.cache.incr("n", 5), 6)
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+        self.assertTrue(self.cache.touch("n", 10))
+        self.assertFalse(self.cache.touch("missing", 10))
+
+    def test_culls_past_max_entries(self):
+        for i in range(20):
+            self.cache.set(f"k{i}", i)
+        rows = self.cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        self.assertLessEqual(rows, 15)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GetOrComputeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self, value="fresh"):
+        self.calls += 1
+        return value
+
+    def set_stale(self, value="stale"):
+        cache.set("hot", CacheEntry(value, 0.01, time.time() - 1), 60)
+
+    def test_computes_once_then_serves_cached_value(self):
+        self.assertEqual(get_or_compute("hot", self.compute, 60), "fresh")
+        self.assertEqual(get_or_compute("hot", self.compute, 60), "fresh")
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_is_served_while_another_worker_refreshes(self):
+        self.set_stale()
+        cache.add("hot:lock", 1, 30)
+        self.assertEqual(get_or_compute("hot", self.compute, 60), "stale")
+        self.assertEqual(self.calls, 0)
+
+    def test_stale_value_is_refreshed_by_lock_winner(self):
+        self.set_stale()
+        self.assertEqual(get_or_compute("hot", self.compute, 60), "fresh")
+        self.assertIsNone(cache.get("hot:lock"))
+
+    def test_database_errors_serve_stale_and_hold_the_lock(self):
+        self.set_stale()
+
+        def failing():
+            raise OperationalError("database is locked")
+
+        with self.assertLogs("apps.core.cache", "WARNING"):
+            self.assertEqual(get_or_compute("hot", failing, 60), "stale")
+        # The lock stays until it expires, so the next reader does not retry
+        self.assertEqual(get_or_compute("hot", self.compute, 60), "stale")
+        self.assertEqual(self.calls, 0)
+
+    def test_cold_miss_errors_propagate(self):
+        def failing():
+            raise OperationalError("database is locked")
+
+        with self.assertRaises(OperationalError):
+            get_or_compute("hot", failing, 60)
+        self.assertIsNone(cache.get("hot:lock"))
+
+    def test_expensive_values_refresh_before_expiry(self):
+        cache.set("hot", CacheEntry("old", 10.0, time.time() + 5), 60)
+        self.assertEqual(get_or_compute("hot", self.compute, 60, beta=1000), "fresh")
+        cache.set("hot", CacheEntry("old", 10.0, time.time() + 5), 60)
+        self.assertEqual(get_or_compute("hot", self.compute, 60, beta=0), "old")
+
+    def test_expire_keeps_value_for_the_refresh(self):
+        get_or_compute("hot", lambda: self.compute("first"), 60)
+        expire("hot")
+        self.assertEqual(cache.get("hot").value, "first")
+        self.assertEqual(get_or_compute("hot", lambda: self.compute("second"), 60), "second")
+
+    def test_concurrent_cold_misses_compute_once(self):
+        def slow():
+            time.sleep(0.2)
+            return self.compute()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute("hot", slow, 60)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["fresh"] * 8)
+        self.assertEqual(self.calls, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GenerationNamespaceTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_generation_is_stable_until_bumped(self):
+        gen = generation("submission:a")
+        self.assertEqual(generation("submission:a"), gen)
+        bump_generation("submission:a")
+        self.assertEqual(generation("submission:a"), gen + 1)
+
+    def test_bump_orphans_dependent_keys(self):
+        key = make_key("page", ["submission:a", "published"], "/p/a/")
+        self.assertEqual(make_key("page", ["published", "submission:a"], "/p/a/"), key)
+        other = make_key("page", ["submission:b"], "/p/b/")
+        bump_generation("submission:a")
+        self.assertNotEqual(make_key("page", ["submission:a", "published"], "/p/a/"), key)
+        self.assertEqual(make_key("page", ["submission:b"], "/p/b/"), other)
+
+    def test_bump_purges_orphaned_keys_in_background(self):
+        key = make_key("page", ["submission:a"], "/p/a/")
+        set_namespaced(key, "html", 60, ["submission:a"])
+        bump_generation("submission:a")
+        wait_for_purges()
+        self.assertIsNone(cache.get(key))
+
+    def test_purge_orphans_catches_up_on_missed_generations(self):
+        key = make_key("page", ["submission:a"], "/p/a/")
+        set_namespaced(key, "html", 60, ["submission:a"])
+        # Bumped without queueing a purge, e.g. by a process that exited
+        cache.incr("gen:submission:a")
+        cache.incr("gen:submission:a")
+        self.assertEqual(purge_orphans("submission:a"), 1)
+        self.assertIsNone(cache.get(key))
+
+    def test_registry_is_capped(self):
+        keys = [make_key("page", ["submission:a"], f"/p/{i}/") for i in range(3)]
+        with patch("apps.core.cache.REGISTRY_MAX_KEYS", 2):
+            for key in keys:
+                set_namespaced(key, "html", 60, ["submission:a"])
+            cache.incr("gen:submission:a")
+            self.assertEqual(purge_orphans("submission:a"), 2)
+        # Past the cap a key is left to expire on its own
+        self.assertEqual([cache.get(key) for key in keys], [None, None, "html"])
+
+    def test_purge_tolerates_a_missing_registry(self):
+        key = make_key("page", ["submission:a"], "/p/a/")
+        set_namespaced(key, "html", 60, ["submission:a"])
+        cache.delete(f"genkeys:submission:a:{generation('submission:a')}")
+        cache.incr("gen:submission:a")
+        self.assertEqual(purge_orphans("submission:a"), 0)
+        self.assertEqual(cache.get(key), "html")
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.comments.models import Comment
+from apps.core.testing import LOCMEM_CACHE, make_submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE, PAGE_CACHE_TIMEOUT=0)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="author", password="pw")
+        self.sub = make_submission(user=self.user, project_name="Conditional", tags=["python"])
+
+    def urls(self):
+        return [
+            reverse("home"),
+            reverse("tag", args=["python"]),
+            reverse("user_profile", args=["author"]),
+            self.sub.get_absolute_url(),
+            reverse("rss"),
+            reverse("sitemap"),
+        ]
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_resources_return_304_without_rendering(self):
+        for url in self.urls():
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertTrue(first.has_header("ETag"))
+                resp = self.revalidate(url, first["ETag"])
+                self.assertEqual(resp.status_code, 304)
+                self.assertEqual(resp.templates, [])
+
+    def test_if_modified_since_for_anonymous_visitors(self):
+        first = self.client.get(self.sub.get_absolute_url())
+        resp = self.client.get(
+            self.sub.get_absolute_url(), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+        self.assertEqual(resp.status_code, 304)
+
+    def test_new_comment_changes_detail_validator(self):
+        url = self.sub.get_absolute_url()
+        etag = self.client.get(url)["ETag"]
+        comment = Comment.objects.create(user=self.user, submission=self.sub, content="hi")
+        resp = self.revalidate(url, etag)
+        self.assertEqual(resp.status_code, 200)
+
+        comment.delete()
+        self.assertEqual(self.revalidate(url, resp["ETag"]).status_code, 200)
+
+    def test_submission_edit_changes_list_validators(self):
+        etags = {url: self.client.get(url)["ETag"] for url in self.urls()}
+        self.sub.tagline = "changed"
+        self.sub.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_tag_change_changes_tag_validator(self):
+        url = reverse("tag", args=["python"])
+        etag = self.client.get(url)["ETag"]
+        self.sub.tags.add("django")
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_validator_depends_on_user(self):
+        url = reverse("home")
+        anon_etag = self.client.get(url)["ETag"]
+        self.client.force_login(self.user)
+        resp = self.revalidate(url, anon_etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(resp.has_header("Last-Modified"))
+        self.assertEqual(self.revalidate(url, resp["ETag"]).status_code, 304)
+
+    def test_csrf_rotation_changes_user_validator(self):
+        url = self.sub.get_absolute_url()
+        self.client.force_login(self.user)
+        resp = self.client.get(url)
+        self.assertContains(resp, "csrfmiddlewaretoken")
+        etag = resp["ETag"]
+        self.assertEqual(self.revalidate(url, etag).status_code, 304)
+        self.client.cookies["csrftoken"] = "r" * 32
+        resp = self.revalidate(url, etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_missing_pages_are_not_validated(self):
+        resp = self.client.get(reverse("user_profile", args=["nobody"]))
+        self.assertEqual(resp.status_code, 404)
+        self.assertFalse(resp.has_header("ETag"))
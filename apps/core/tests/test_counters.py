@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from apps.comments.models import Comment
+from apps.core.models import AuthorStats
+from apps.core.testing import LOCMEM_CACHE, make_submission
+from apps.submissions.models import Submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="author", password="pw")
+        self.sub = self._submission("Counted")
+
+    def _submission(self, name, status="published", user=None):
+        return make_submission(user=user or self.user, project_name=name, status=status)
+
+    def comment_count(self):
+        return Submission.objects.get(pk=self.sub.pk).comment_count
+
+    def published_count(self, user=None):
+        stats = AuthorStats.objects.filter(user=user or self.user).first()
+        return stats.published_count if stats else 0
+
+    def test_comment_count_follows_create_and_soft_delete(self):
+        comment = Comment.objects.create(user=self.user, submission=self.sub, content="a")
+        Comment.objects.create(user=self.user, submission=self.sub, parent=comment, content="b")
+        self.assertEqual(self.comment_count(), 2)
+
+        comment = Comment.objects.get(pk=comment.pk)
+        comment.is_deleted = True
+        comment.save()
+        self.assertEqual(self.comment_count(), 1)
+        comment.content = "edited"
+        comment.save()
+        self.assertEqual(self.comment_count(), 1)
+
+    def test_hard_delete_counts_only_visible_comments(self):
+        top = Comment.objects.create(user=self.user, submission=self.sub, content="a")
+        Comment.objects.create(user=self.user, submission=self.sub, parent=top, content="b")
+        top.is_deleted = True
+        top.save()
+        # Cascades to the reply; the soft-deleted parent was already uncounted
+        top.delete()
+        self.assertEqual(self.comment_count(), 0)
+
+    def test_published_count_follows_status_and_delete(self):
+        self.assertEqual(self.published_count(), 1)
+        draft = self._submission("Draft", status="draft")
+        self.assertEqual(self.published_count(), 1)
+
+        draft.status = "published"
+        draft.save()
+        self.assertEqual(self.published_count(), 2)
+        self.sub.status = "draft"
+        self.sub.save()
+        self.assertEqual(self.published_count(), 1)
+        draft.delete()
+        self.assertEqual(self.published_count(), 0)
+
+    def test_reassigned_submission_moves_count(self):
+        other = get_user_model().objects.create_user(username="other", password="pw")
+        self.sub.user = other
+        self.sub.save()
+        self.assertEqual(self.published_count(), 0)
+        self.assertEqual(self.published_count(other), 1)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0)
+    def test_can_comment_uses_published_count(self):
+        drafter = get_user_model().objects.create_user(username="drafter", password="pw")
+        self._submission("Only a draft", status="draft", user=drafter)
+        self.client.force_login(drafter)
+        resp = self.client.get(self.sub.get_absolute_url())
+        self.assertFalse(resp.context["can_comment"])
+
+        self.client.force_login(self.user)
+        resp = self.client.get(self.sub.get_absolute_url())
+        self.assertTrue(resp.context["can_comment"])
+
+    def test_recount_repairs_drift(self):
+        Comment.objects.create(user=self.user, submission=self.sub, content="a")
+        Submission.objects.filter(pk=self.sub.pk).update(comment_count=7)
+        AuthorStats.objects.filter(user=self.user).update(published_count=0)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("recount", "--check", stdout=out)
+        self.assertIn(f"submission {self.sub.slug}: comment_count 7, recount 1", out.getvalue())
+
+        out = StringIO()
+        call_command("recount", stdout=out)
+        self.assertIn("1 submissions, 1 authors fixed", out.getvalue())
+        self.assertEqual(self.comment_count(), 1)
+        self.assertEqual(self.published_count(), 1)
+        call_command("recount", "--check", stdout=StringIO())
@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.comments.models import Comment
+from apps.core.cache import bump_generation, make_key
+from apps.core.models import PublishedTag
+from apps.core.testing import LOCMEM_CACHE, make_submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE, PAGE_CACHE_TIMEOUT=0)
+class FragmentCacheTagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.template = Template(
+            '{% load fragment_cache %}{% fragment_cache "f" "ns" key %}{{ value }}{% endfragment_cache %}'
+        )
+
+    def render(self, **context):
+        return self.template.render(Context(context))
+
+    def test_cached_until_namespace_is_bumped(self):
+        self.assertEqual(self.render(key="a", value="one"), "one")
+        self.assertEqual(self.render(key="a", value="two"), "one")
+        self.assertEqual(self.render(key="b", value="two"), "two")
+        bump_generation("ns")
+        self.assertEqual(self.render(key="a", value="three"), "three")
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+    def test_disabled_by_zero_timeout(self):
+        self.render(key="a", value="one")
+        self.assertEqual(self.render(key="a", value="two"), "two")
+
+
+@override_settings(CACHES=LOCMEM_CACHE, PAGE_CACHE_TIMEOUT=0)
+class PageFragmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.author = User.objects.create_user(username="author", password="pw")
+        self.reader = User.objects.create_user(username="reader", password="pw")
+        self.sub = make_submission(user=self.author, project_name="Fragments", tags=["python"])
+        self.comment = Comment.objects.create(
+            user=self.author, submission=self.sub, content="first comment"
+        )
+
+    def test_tag_nav_follows_catalog_version(self):
+        self.assertContains(self.client.get(reverse("home")), "#python")
+        # Written without signals: the cached nav is still served
+        PublishedTag.objects.filter(slug="python").update(name="Pythonista")
+        self.assertNotContains(self.client.get(reverse("home")), "Pythonista")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sub.tags.add("django")
+        resp = self.client.get(reverse("home"))
+        self.assertContains(resp, "#django")
+        self.assertContains(resp, "Pythonista")
+
+    def test_tag_nav_varies_on_active_tag(self):
+        resp = self.client.get(reverse("tag", args=["python"]))
+        self.assertContains(resp, 'class="w1 active"')
+        self.assertNotContains(self.client.get(reverse("home")), "active\" title")
+
+    def test_cached_thread_shows_absolute_times(self):
+        resp = self.client.get(self.sub.get_absolute_url())
+        created = self.comment.created_at.isoformat()
+        self.assertContains(resp, f'<time datetime="{created}">')
+        self.assertNotContains(resp, " ago</p>")
+
+    def test_comment_thread_follows_submission_version(self):
+        url = self.sub.get_absolute_url()
+        self.assertContains(self.client.get(url), "first comment")
+        Comment.objects.filter(pk=self.comment.pk).update(rendered_html="<p>sneaky</p>")
+        self.assertNotContains(self.client.get(url), "sneaky")
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(user=self.reader, submission=self.sub, content="second comment")
+        resp = self.client.get(url)
+        self.assertContains(resp, "second comment")
+        self.assertContains(resp, "sneaky")
+
+    def test_one_cached_thread_serves_every_user(self):
+        url = self.sub.get_absolute_url()
+        reply_url = f'{reverse("comment_form")}?parent={self.comment.pk}'
+        delete_url = reverse("comment_delete", args=[self.comment.pk])
+        anonymous = self.client.get(url).content.decode()
+        self.assertNotIn("comment-actions", anonymous)
+        self.assertNotIn(delete_url, anonymous)
+
+        self.client.force_login(self.author)
+        author = self.client.get(url).content.decode()
+        self.assertIn(reply_url, author)
+        self.assertIn(f'<form method="post" action="{delete_url}">', author)
+        self.assertIn("csrfmiddlewaretoken", author)
+
+        self.client.force_login(self.reader)
+        reader = self.client.get(url).content.decode()
+        self.assertNotIn("comment-actions", reader)
+
+        # Only the markers are cached; every user above was served this copy
+        fragment = cache.get(make_key("fragment", [f"submission:{self.sub.slug}"], "comments"))
+        self.assertIn(f"<!--comment-actions:{self.comment.pk}:{self.author.pk}-->", fragment)
+        self.assertNotIn("Reply", fragment)
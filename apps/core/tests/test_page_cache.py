@@ -0,0 +1,145 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.comments.models import Comment
+from apps.core.testing import LOCMEM_CACHE, make_submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="author", password="pw")
+        self.sub = self._submission("Cached")
+        self.sub.tags.set(["python"])
+        self.other = self._submission("Other")
+
+    def _submission(self, name):
+        return make_submission(user=self.user, project_name=name)
+
+    def assertCache(self, url, state):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["X-Page-Cache"], state)
+        return resp
+
+    def test_anonymous_pages_are_cached(self):
+        urls = [
+            reverse("home"),
+            reverse("tag", args=["python"]),
+            reverse("user_profile", args=["author"]),
+            self.sub.get_absolute_url(),
+        ]
+        for url in urls:
+            first = self.assertCache(url, "MISS")
+            second = self.assertCache(url, "HIT")
+            self.assertEqual(first.content, second.content)
+
+    def test_query_string_is_part_of_the_key(self):
+        url = reverse("user_profile", args=["author"])
+        self.assertCache(url, "MISS")
+        self.assertCache(url + "?ref=feed", "MISS")
+        self.assertCache(url, "HIT")
+
+    def test_authenticated_requests_bypass_cache(self):
+        url = reverse("home")
+        self.assertCache(url, "MISS")
+        self.client.force_login(self.user)
+        resp = self.client.get(url)
+        self.assertNotIn("X-Page-Cache", resp)
+        self.assertContains(resp, "/accounts/logout/")
+
+    def test_comment_invalidates_its_detail_page_and_listings(self):
+        urls = [reverse("home"), self.sub.get_absolute_url(), self.other.get_absolute_url()]
+        for url in urls:
+            self.assertCache(url, "MISS")
+        with self.captureOnCommitCallbacks(execute=True):
+            comment = Comment.objects.create(user=self.user, submission=self.sub, content="hello there")
+        self.assertContains(self.assertCache(self.sub.get_absolute_url(), "MISS"), "hello there")
+        self.assertCache(self.other.get_absolute_url(), "HIT")
+        # Listings show the comment count
+        self.assertContains(self.assertCache(reverse("home"), "MISS"), "(1 comment)")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.content = "edited"
+            comment.save()
+        self.assertContains(self.assertCache(self.sub.get_absolute_url(), "MISS"), "edited")
+        self.assertCache(reverse("home"), "HIT")
+
+    def test_submission_edit_invalidates_its_pages(self):
+        profile = reverse("user_profile", args=["author"])
+        for url in (reverse("home"), profile, self.sub.get_absolute_url()):
+            self.assertCache(url, "MISS")
+        self.assertCache(self.other.get_absolute_url(), "MISS")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sub.tagline = "Renamed tagline"
+            self.sub.save()
+
+        self.assertContains(self.assertCache(reverse("home"), "MISS"), "Renamed tagline")
+        self.assertCache(profile, "MISS")
+        self.assertCache(self.sub.get_absolute_url(), "MISS")
+        self.assertCache(self.other.get_absolute_url(), "HIT")
+
+    def test_edit_invalidates_once_committed(self):
+        url = self.sub.get_absolute_url()
+        self.assertCache(url, "MISS")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sub.tagline = "Renamed tagline"
+            self.sub.save()
+            # A reader before the commit must not refill the page from old rows
+            self.assertCache(url, "HIT")
+        self.assertContains(self.assertCache(url, "MISS"), "Renamed tagline")
+
+    def test_tag_change_invalidates_tag_pages(self):
+        python = reverse("tag", args=["python"])
+        rust = reverse("tag", args=["rust"])
+        self.assertCache(python, "MISS")
+        self.assertCache(rust, "MISS")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.tags.add("rust")
+        self.assertCache(python, "MISS")
+        self.assertContains(self.assertCache(rust, "MISS"), "Other")
+
+    def test_delete_invalidates_pages(self):
+        self.assertCache(reverse("home"), "MISS")
+        self.assertCache(reverse("tag", args=["python"]), "MISS")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sub.delete()
+        self.assertNotContains(self.assertCache(reverse("home"), "MISS"), "Cached")
+        self.assertCache(reverse("tag", args=["python"]), "MISS")
+
+    def test_feed_and_sitemap_are_cached_with_their_headers(self):
+        for url in (reverse("rss"), reverse("sitemap")):
+            first = self.assertCache(url, "MISS")
+            second = self.assertCache(url, "HIT")
+            self.assertEqual(first["Content-Type"], second["Content-Type"])
+        self.assertEqual(second["X-Robots-Tag"], first["X-Robots-Tag"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.delete()
+        self.assertNotContains(self.assertCache(reverse("rss"), "MISS"), "Other")
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_disabled_by_zero_timeout(self):
+        resp = self.client.get(reverse("home"))
+        self.assertNotIn("X-Page-Cache", resp)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PurgeCacheOrphansCommandTests(TestCase):
+    def test_purges_pages_of_missed_generations(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(username="author", password="pw")
+        sub = make_submission(user=user, project_name="Orphan")
+        self.client.get(sub.get_absolute_url())
+        cache.incr(f"gen:submission:{sub.slug}")
+
+        out = StringIO()
+        call_command("purge_cache_orphans", stdout=out)
+        # The detail page and its comment thread fragment
+        self.assertIn("Purged 2 orphaned keys", out.getvalue())
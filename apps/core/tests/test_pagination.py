@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.pagination import encode_cursor
+from apps.core.testing import LOCMEM_CACHE, make_submission
+from apps.submissions.models import Submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE, PAGE_CACHE_TIMEOUT=0)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="author", password="pw")
+        start = timezone.now() - timedelta(days=1)
+        self.subs = [
+            make_submission(user=self.user, project_name=f"Project {i:02d}", tags=["python"])
+            for i in range(45)
+        ]
+        # Pairs of equal timestamps exercise the id tie-breaker
+        for i, sub in enumerate(self.subs):
+            Submission.objects.filter(pk=sub.pk).update(created_at=start + timedelta(minutes=i // 2))
+        # Newest first, as listed
+        self.expected = [s.pk for s in sorted(self.subs, key=lambda s: s.pk, reverse=True)]
+        self.url = reverse("tag", args=["python"])
+
+    def page(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return resp, [s.pk for s in resp.context["submissions"]]
+
+    def test_walks_forward_and_back(self):
+        resp, first = self.page(self.url)
+        self.assertEqual(first, self.expected[:20])
+        page = resp.context["page_obj"]
+        self.assertFalse(page.has_previous)
+        self.assertEqual(page.total, 45)
+        next_url = f"{self.url}?after={page.next_cursor}"
+        self.assertContains(resp, f'<link rel="next" href="{next_url}">')
+        self.assertNotContains(resp, 'rel="prev"')
+        self.assertNotContains(resp, "noindex")
+
+        resp, second = self.page(next_url)
+        self.assertEqual(second, self.expected[20:40])
+        self.assertContains(resp, "noindex,follow")
+        resp, third = self.page(f"{self.url}?after={resp.context['page_obj'].next_cursor}")
+        self.assertEqual(third, self.expected[40:])
+        page = resp.context["page_obj"]
+        self.assertFalse(page.has_next)
+
+        resp, back = self.page(f"{self.url}?before={page.previous_cursor}")
+        self.assertEqual(back, second)
+        resp, start = self.page(f"{self.url}?before={resp.context['page_obj'].previous_cursor}")
+        self.assertEqual(start, first)
+        self.assertFalse(resp.context["page_obj"].has_previous)
+
+    def test_cursor_is_stable_across_inserts(self):
+        resp, _ = self.page(self.url)
+        next_url = f"{self.url}?after={resp.context['page_obj'].next_cursor}"
+        make_submission(user=self.user, project_name="Newest", tags=["python"])
+        _, second = self.page(next_url)
+        self.assertEqual(second, self.expected[20:40])
+
+    @override_settings(LISTING_SHOW_TOTAL=False)
+    def test_cursor_pages_skip_count_and_offset(self):
+        resp, _ = self.page(self.url)
+        next_url = f"{self.url}?after={resp.context['page_obj'].next_cursor}"
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.page(next_url)
+        sql = " ".join(q["sql"] for q in queries).upper()
+        self.assertNotIn("OFFSET", sql)
+        self.assertNotIn("COUNT(*)", sql)
+
+    def test_invalid_cursor_is_404(self):
+        self.assertEqual(self.client.get(f"{self.url}?after=not-a-cursor").status_code, 404)
+
+    def test_out_of_range_or_naive_cursor_is_404(self):
+        now = timezone.now()
+        for cursor in (
+            encode_cursor(now, 2 ** 64),
+            encode_cursor(now, 0),
+            encode_cursor(now.replace(tzinfo=None), 1),
+        ):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(f"{self.url}?after={cursor}").status_code, 404)
+                self.assertEqual(self.client.get(f"{self.url}?before={cursor}").status_code, 404)
+
+    def test_page_past_the_end_links_back(self):
+        oldest = Submission.objects.get(pk=self.expected[-1])
+        cursor = encode_cursor(oldest.created_at, oldest.pk)
+        resp, rows = self.page(f"{self.url}?after={cursor}")
+        self.assertEqual(rows, [])
+        page = resp.context["page_obj"]
+        self.assertEqual(page.previous_cursor, cursor)
+        _, back = self.page(f"{self.url}?before={page.previous_cursor}")
+        self.assertEqual(back, self.expected[24:44])
+
+    def test_old_tag_page_urls_redirect(self):
+        resp = self.client.get(reverse("tag_page", args=["python", 2]))
+        self.assertEqual(resp.status_code, 301)
+        _, second = self.page(resp["Location"])
+        self.assertEqual(second, self.expected[20:40])
+        boundary = Submission.objects.get(pk=self.expected[19])
+        self.assertEqual(
+            resp["Location"], f"{self.url}?after={encode_cursor(boundary.created_at, boundary.pk)}"
+        )
+
+        self.assertRedirects(
+            self.client.get(reverse("tag_page", args=["python", 1])), self.url, status_code=301
+        )
+        self.assertRedirects(
+            self.client.get(reverse("tag_page", args=["python", 99])), self.url, status_code=301
+        )
+
+    def test_old_profile_page_urls_redirect(self):
+        url = reverse("user_profile", args=["author"])
+        resp = self.client.get(f"{url}?page=3")
+        self.assertEqual(resp.status_code, 301)
+        _, third = self.page(resp["Location"])
+        self.assertEqual(third, self.expected[40:])
+        self.assertRedirects(self.client.get(f"{url}?page=x"), url, status_code=301)
@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.test import TestCase, override_settings
+
+from apps.core.query_cache import CachedListing, bump_table, cached_count, cached_rows
+from apps.core.testing import LOCMEM_CACHE, make_submission
+from apps.submissions.models import LISTING_FIELDS, Submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE, QUERY_CACHE_TIMEOUT=300)
+class QueryCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="author", password="pw")
+        self.subs = [self._submission(f"Project {i}") for i in range(3)]
+        self.subs[0].tags.set(["python"])
+
+    def _submission(self, name):
+        return make_submission(user=self.user, project_name=name)
+
+    def published(self):
+        return Submission.objects.filter(status="published").order_by("-created_at", "-id")
+
+    def test_rows_are_served_from_cache(self):
+        first = cached_rows(self.published()[:20], LISTING_FIELDS)
+        with self.assertNumQueries(0):
+            again = cached_rows(self.published()[:20], LISTING_FIELDS)
+        self.assertEqual([s.pk for s in again], [s.pk for s in first])
+        self.assertEqual(again[0].slug, first[0].slug)
+        self.assertEqual(again[0].get_absolute_url(), first[0].get_absolute_url())
+
+    def test_different_params_use_different_keys(self):
+        cached_rows(self.published()[:1], LISTING_FIELDS)
+        self.assertEqual(len(cached_rows(self.published()[:2], LISTING_FIELDS)), 2)
+
+    def test_submission_save_invalidates(self):
+        cached_rows(self.published(), LISTING_FIELDS)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subs[1].project_name = "Renamed"
+            self.subs[1].save()
+        names = {s.project_name for s in cached_rows(self.published(), LISTING_FIELDS)}
+        self.assertIn("Renamed", names)
+
+    def test_tag_change_invalidates_joined_query(self):
+        tagged = self.published().filter(tags__name__in=["python"])
+        self.assertEqual(len(cached_rows(tagged, LISTING_FIELDS)), 1)
+        # Adding a tag writes only the taggit tables
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subs[2].tags.add("python")
+        self.assertEqual(len(cached_rows(tagged, LISTING_FIELDS)), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subs[2].tags.remove("python")
+        self.assertEqual(len(cached_rows(tagged, LISTING_FIELDS)), 1)
+
+    def test_update_needs_explicit_bump(self):
+        cached_rows(self.published(), LISTING_FIELDS)
+        Submission.objects.filter(pk=self.subs[0].pk).update(project_name="Bulk")
+        bump_table(Submission)
+        names = {s.project_name for s in cached_rows(self.published(), LISTING_FIELDS)}
+        self.assertIn("Bulk", names)
+
+    def test_count_is_cached(self):
+        self.assertEqual(cached_count(self.published()), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_count(self.published()), 3)
+
+    def test_listing_paginates(self):
+        paginator = Paginator(CachedListing(self.published(), LISTING_FIELDS), 2)
+        self.assertEqual(paginator.num_pages, 2)
+        first = [s.pk for s in paginator.page(1).object_list]
+        self.assertEqual(len(paginator.page(2).object_list), 1)
+        with self.assertNumQueries(0):
+            page = Paginator(CachedListing(self.published(), LISTING_FIELDS), 2).page(1)
+            self.assertEqual([s.pk for s in page.object_list], first)
+
+    @override_settings(QUERY_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables(self):
+        cached_rows(self.published(), LISTING_FIELDS)
+        with self.assertNumQueries(1):
+            cached_rows(self.published(), LISTING_FIELDS)
@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from apps.core.models import PublishedTag
+from apps.core.testing import LOCMEM_CACHE, make_submission
+from apps.core.utils import get_tag_items
+from apps.submissions.models import Submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TagCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="author", password="pw")
+
+    def _submission(self, tags=(), status="published"):
+        return make_submission(user=self.user, project_name="Tagged", status=status, tags=tags)
+
+    def counts(self):
+        return dict(PublishedTag.objects.filter(count__gt=0).values_list("slug", "count"))
+
+    def assertMatchesRecount(self):
+        self.assertEqual(PublishedTag.objects.diff(), [])
+
+    def test_tag_changes_update_counts(self):
+        first = self._submission(["Python", "Django"])
+        self._submission(["Python"])
+        self.assertEqual(self.counts(), {"python": 2, "django": 1})
+
+        first.tags.remove("Django")
+        first.tags.add("Rust")
+        self.assertEqual(self.counts(), {"python": 2, "rust": 1})
+        first.tags.clear()
+        self.assertEqual(self.counts(), {"python": 1})
+        self.assertMatchesRecount()
+
+    def test_drafts_are_not_counted(self):
+        self._submission(["Python"], status="flagged")
+        self.assertEqual(self.counts(), {})
+
+    def test_status_changes_update_counts(self):
+        sub = self._submission(["Python"])
+        sub.status = "removed"
+        sub.save()
+        self.assertEqual(self.counts(), {})
+        sub.status = "published"
+        sub.save()
+        self.assertEqual(self.counts(), {"python": 1})
+        self.assertMatchesRecount()
+
+    def test_admin_actions_update_counts(self):
+        sub = self._submission(["Python"])
+        admin = site._registry[Submission]
+        admin.mark_flagged(None, Submission.objects.filter(pk=sub.pk))
+        self.assertEqual(self.counts(), {})
+        admin.mark_published(None, Submission.objects.filter(pk=sub.pk))
+        self.assertEqual(self.counts(), {"python": 1})
+
+    def test_delete_updates_counts(self):
+        sub = self._submission(["Python"])
+        sub.delete()
+        self.assertEqual(self.counts(), {})
+
+    def test_get_tag_items_reads_catalog(self):
+        self._submission(["Python", "Django"])
+        self._submission(["Python"])
+        names, items, mapping = get_tag_items()
+        self.assertEqual(set(names), {"Python", "Django"})
+        self.assertEqual(mapping, {"python": "Python", "django": "Django"})
+        by_slug = {item["slug"]: item for item in items}
+        self.assertEqual(by_slug["python"]["count"], 2)
+        self.assertGreater(by_slug["python"]["weight"], by_slug["django"]["weight"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._submission(["Rust"])
+        self.assertIn("rust", get_tag_items()[2])
+
+    def test_check_and_rebuild(self):
+        self._submission(["Python"])
+        call_command("rebuild_tag_catalog", "--check", stdout=StringIO())
+
+        PublishedTag.objects.filter(slug="python").update(count=7)
+        PublishedTag.objects.create(slug="stale", name="Stale", count=3)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_tag_catalog", "--check", stdout=StringIO())
+
+        out = StringIO()
+        call_command("rebuild_tag_catalog", stdout=out)
+        self.assertIn("2 rows fixed", out.getvalue())
+        self.assertEqual(self.counts(), {"python": 1})
+        self.assertMatchesRecount()
+
+    def test_rebuild_orphans_cached_tag_items(self):
+        self._submission(["Python"])
+        PublishedTag.objects.filter(slug="python").update(count=7)
+        self.assertEqual(get_tag_items()[1][0]["count"], 7)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PublishedTag.objects.rebuild()
+        self.assertEqual(get_tag_items()[1][0]["count"], 1)
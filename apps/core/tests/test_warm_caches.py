@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.core.testing import LOCMEM_CACHE, make_submission
+from apps.submissions.models import Submission
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class WarmCachesCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(username="author", password="pw")
+        self.sub = make_submission(user=user, project_name="Warm", idea="*idea*")
+        Submission.objects.filter(pk=self.sub.pk).update(html_version=0, idea_html="")
+        cache.clear()
+
+    def test_warms_pages_and_stale_html(self):
+        out = StringIO()
+        call_command("warm_caches", "--workers", "1", stdout=out)
+        output = out.getvalue()
+        self.assertIn("[5/5]", output)
+        self.assertIn("Warmed 5/5 entries", output)
+
+        self.sub.refresh_from_db()
+        self.assertFalse(self.sub.html_is_stale)
+        self.assertEqual(self.sub.idea_html, "<p><em>idea</em></p>")
+        for url in (reverse("home"), reverse("rss"), reverse("sitemap"), self.sub.get_absolute_url()):
+            self.assertEqual(self.client.get(url)["X-Page-Cache"], "HIT")
+
+    def test_limit_bounds_submissions(self):
+        out = StringIO()
+        call_command("warm_caches", "--workers", "1", "--limit", "0", stdout=out)
+        self.assertIn("Warmed 4/4 entries", out.getvalue())
+        self.sub.refresh_from_db()
+        self.assertTrue(self.sub.html_is_stale)
@@ -1,10 +1,10 @@
 from django.urls import path
-from .views import HomeView, TagView, UserProfileView, MyProfileRedirectView
+from .views import HomeView, TagView, TagPageRedirectView, UserProfileView, MyProfileRedirectView
 
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
     path('tag/<slug:slug>/', TagView.as_view(), name='tag'),
-    path('tag/<slug:slug>/page/<int:page>/', TagView.as_view(), name='tag_page'),
+    path('tag/<slug:slug>/page/<int:page>/', TagPageRedirectView.as_view(), name='tag_page'),
     path('u/me/', MyProfileRedirectView.as_view(), name='my_profile'),
     path('u/<str:username>/', UserProfileView.as_view(), name='user_profile'),
 ]
@@ -1,29 +1,30 @@
-from django.utils.text import slugify
-from apps.submissions.models import Submission
-from django.core.cache import cache
+import math
+
+from .cache import get_or_compute, make_key
+from .models import PublishedTag
+
+
+def _weight(count, top):
+    """Scale a tag count to a 1-4 cloud weight on a log scale."""
+    if top <= 1:
+        return 1
+    return 1 + round(3 * math.log(count) / math.log(top))
 
 
 def get_tag_items():
     """Return ordered tag names, tag items and slug-to-name mapping."""
-    cache_key = 'tags:v2'
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
+    # Catalog writes bump 'tags', so readers miss rather than get stale counts
+    key = make_key('tag_items', ['tags'])
+    return get_or_compute(key, _load_tag_items, 60 * 60)
 
-    names = []
-    for s in Submission.objects.filter(status='published').prefetch_related('tags'):
-        names.extend([t for t in s.tags.names() if t])
-    seen = set()
-    names = [t for t in names if not (t in seen or seen.add(t))]
-    tag_items = []
-    mapping = {}
-    for name in names:
-        slug = slugify(name)
-        if slug in mapping:
-            continue
-        mapping[slug] = name
-        tag_items.append({'slug': slug, 'name': name})
 
-    data = (names, tag_items, mapping)
-    cache.set(cache_key, data, 10 * 60)  # 10 minutes
-    return data
+def _load_tag_items():
+    tags = list(PublishedTag.objects.filter(count__gt=0).only('slug', 'name', 'count'))
+    top = max((tag.count for tag in tags), default=1)
+    names = [tag.name for tag in tags]
+    tag_items = [
+        {'slug': tag.slug, 'name': tag.name, 'count': tag.count, 'weight': _weight(tag.count, top)}
+        for tag in tags
+    ]
+    mapping = {tag.slug: tag.name for tag in tags}
+    return names, tag_items, mapping
@@ -2,20 +2,66 @@ from django.views.generic import TemplateView, RedirectView
 from django.views.generic.edit import FormView
 from django.contrib.auth import get_user_model
 from django.http import Http404
+from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.contrib.auth import login as auth_login
-from apps.submissions.models import Submission
+from apps.submissions.models import LISTING_FIELDS, Submission
+from .conditional import conditional_page, published_signature, tag_catalog_signature
+from .page_cache import CachedPageMixin
+from .pagination import keyset_page, legacy_page_url
+from .query_cache import cached_rows
 from .utils import get_tag_items
 from .forms import SignupForm
 
 
-class HomeView(TemplateView):
+def home_validator(request, **kwargs):
+    last, count, comments = published_signature(Submission.objects.filter(status='published'))
+    return last, (count, comments, *tag_catalog_signature())
+
+
+def tag_submissions(slug):
+    """Published submissions listed under `slug`; every one for an unknown tag."""
+    qs = Submission.objects.filter(status='published')
+    active_name = get_tag_items()[2].get(slug)
+    if active_name:
+        qs = qs.filter(tags__name__in=[active_name])
+    return qs
+
+
+def profile_submissions(username):
+    # Respect anonymity: do not list anonymous posts on profile
+    return Submission.objects.filter(
+        status='published', is_anonymous=False, user__username=username
+    )
+
+
+def tag_validator(request, slug, **kwargs):
+    last, count, comments = published_signature(tag_submissions(slug))
+    return last, (count, comments, *tag_catalog_signature())
+
+
+def profile_validator(request, username, **kwargs):
+    if 'page' in request.GET:
+        # Old numbered pages redirect into cursor space; see UserProfileView.get()
+        return None
+    last, count, comments = published_signature(profile_submissions(username))
+    if not count and not get_user_model().objects.filter(username=username).exists():
+        return None
+    return last, (count, comments)
+
+
+@method_decorator(conditional_page(home_validator), name='dispatch')
+class HomeView(CachedPageMixin, TemplateView):
     template_name = 'core/home.html'
 
+    def page_cache_namespaces(self):
+        return ['published', 'tags']
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         qs = Submission.objects.filter(status='published')
-        ctx['submissions'] = qs.order_by('-created_at')[:20]
+        ctx['submissions'] = cached_rows(qs.order_by('-created_at')[:20], LISTING_FIELDS)
 
         names, tag_items, _ = get_tag_items()
         ctx['tags'] = names
@@ -24,29 +70,27 @@ class HomeView(TemplateView):
         return ctx
 
 
-class TagView(TemplateView):
+@method_decorator(conditional_page(tag_validator), name='dispatch')
+class TagView(CachedPageMixin, TemplateView):
     template_name = 'core/tag.html'
 
+    def page_cache_namespaces(self):
+        slug = self.kwargs.get('slug')
+        if slug not in get_tag_items()[2]:
+            # Unknown tags list every published submission
+            return ['tags', 'published']
+        return ['tags', f'tag:{slug}']
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         slug = kwargs.get('slug')
-        page = int(kwargs.get('page') or 1)
 
         names, tag_items, mapping = get_tag_items()
-        active_name = mapping.get(slug)
-
-        qs = Submission.objects.filter(status='published').order_by('-created_at')
-        if active_name:
-            qs = qs.filter(tags__name__in=[active_name])
-
-        from django.core.paginator import Paginator
-        paginator = Paginator(qs, 20)
-        page_obj = paginator.get_page(page)
+        page_obj = keyset_page(tag_submissions(slug), LISTING_FIELDS, self.request.GET)
 
         ctx['tag_slug'] = slug
-        ctx['tag_name'] = active_name or slug
+        ctx['tag_name'] = mapping.get(slug) or slug
         ctx['submissions'] = page_obj.object_list
-        ctx['paginator'] = paginator
         ctx['page_obj'] = page_obj
         ctx['tags'] = names
         ctx['tag_items'] = tag_items
@@ -54,9 +98,32 @@ class TagView(TemplateView):
         return ctx
 
 
-class UserProfileView(TemplateView):
+class TagPageRedirectView(RedirectView):
+    """Send old `/tag/<slug>/page/<n>/` URLs to the matching cursor page."""
+
+    permanent = True
+
+    def get_redirect_url(self, slug, page):
+        return legacy_page_url(reverse('tag', args=[slug]), tag_submissions(slug), page)
+
+
+@method_decorator(conditional_page(profile_validator), name='dispatch')
+class UserProfileView(CachedPageMixin, TemplateView):
     template_name = 'core/profile.html'
 
+    def page_cache_namespaces(self):
+        return [f"user:{self.kwargs.get('username')}"]
+
+    def get(self, request, *args, **kwargs):
+        if 'page' in request.GET:
+            username = kwargs.get('username')
+            url = reverse('user_profile', args=[username])
+            return redirect(
+                legacy_page_url(url, profile_submissions(username), request.GET['page']),
+                permanent=True,
+            )
+        return super().get(request, *args, **kwargs)
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         username = kwargs.get('username')
@@ -66,23 +133,10 @@ class UserProfileView(TemplateView):
         except User.DoesNotExist:
             raise Http404("User not found")
 
-        # Respect anonymity: do not list anonymous posts on profile
-        from apps.submissions.models import Submission
-        published_qs = (
-            Submission.objects
-            .filter(status='published', user=user, is_anonymous=False)
-            .order_by('-created_at')
-        )
-
-        # Pagination for published items
-        from django.core.paginator import Paginator
-        page = int(self.request.GET.get('page') or 1)
-        paginator = Paginator(published_qs, 20)
-        page_obj = paginator.get_page(page)
+        page_obj = keyset_page(profile_submissions(username), LISTING_FIELDS, self.request.GET)
 
         ctx['profile_user'] = user
         ctx['submissions'] = page_obj.object_list
-        ctx['paginator'] = paginator
         ctx['page_obj'] = page_obj
         return ctx
 
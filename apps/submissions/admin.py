@@ -9,17 +9,23 @@ class SubmissionAdmin(admin.ModelAdmin):
     search_fields = ('project_name', 'tagline')
     actions = ['mark_published', 'mark_removed', 'mark_flagged']
 
+    def _set_status(self, queryset, status):
+        # Save one by one so the tag catalog and page cache receivers run
+        for submission in queryset.exclude(status=status):
+            submission.status = status
+            submission.save()
+
     @admin.action(description='Mark selected as published')
     def mark_published(self, request, queryset):
-        queryset.update(status='published')
+        self._set_status(queryset, 'published')
 
     @admin.action(description='Mark selected as removed')
     def mark_removed(self, request, queryset):
-        queryset.update(status='removed')
+        self._set_status(queryset, 'removed')
 
     @admin.action(description='Mark selected as flagged')
     def mark_flagged(self, request, queryset):
-        queryset.update(status='flagged')
+        self._set_status(queryset, 'flagged')
 
 
 # Report removed for MVP
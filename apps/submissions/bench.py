@@ -0,0 +1,130 @@
+"""Markdown rendering benchmark corpus and runner.
+
+Used by `manage.py bench_markdown`; kept separate so the corpus can be
+reused from a shell or other benchmarks.
+"""
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import bleach
+import markdown
+
+from apps.submissions.management.commands.seed_submissions import markdown_block, paragraph
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "internetguzeldir_submission.json"
+FIXTURE_FIELDS = ("description", "idea", "tech", "wins", "failure", "lessons")
+
+
+def fixture_texts() -> list:
+    with open(FIXTURE_PATH, encoding="utf-8") as fh:
+        objects = json.load(fh)
+    return [
+        obj["fields"][field]
+        for obj in objects
+        for field in FIXTURE_FIELDS
+        if obj["fields"].get(field)
+    ]
+
+
+def build_corpus(seed: int = 0, size: int = 20) -> dict:
+    """Return {input class: [markdown texts]}."""
+    random.seed(seed)
+    return {
+        "seed": [markdown_block() for _ in range(size)],
+        "fixture": fixture_texts(),
+        "comment": [paragraph(random.randint(1, 2)) for _ in range(size)],
+        "thread": [comment_text() for _ in range(size * 25)],
+        "deep_nesting": [
+            "\n".join("> " * depth + "quoted" for depth in range(1, 60)),
+            "\n".join("    " * depth + "- item" for depth in range(60)),
+        ],
+        "huge_list": ["\n".join(f"- item {i} **bold** `code`" for i in range(3000))],
+        "link_run": [" ".join(f"[link {i}](https://example.com/{i})" for i in range(1500))],
+        "emphasis_run": ["*a **b " * 2000, "_" * 5000 + "x" + "_" * 5000],
+    }
+
+
+def comment_text() -> str:
+    """A short comment with the occasional link or inline code."""
+    text = paragraph(random.randint(1, 2))
+    if random.random() < 0.3:
+        text += " See [this](https://example.com/thread) for details."
+    if random.random() < 0.2:
+        text += " Try `pip install it`, *maybe*."
+    return text
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(render, texts: list, iterations: int = 5) -> dict:
+    """Time `render` over `texts` and trace its peak allocation."""
+    render(texts[0])  # warm up per-thread parser/cleaner
+    latencies = []
+    for _ in range(iterations):
+        for text in texts:
+            start = time.perf_counter()
+            render(text)
+            latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        for text in texts:
+            render(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "inputs": len(texts),
+        "renders": len(latencies),
+        "renders_per_sec": round(len(latencies) / total, 2) if total else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run(render, corpus: dict, iterations: int = 5, classes=None) -> dict:
+    results = {}
+    for name, texts in corpus.items():
+        if classes and name not in classes:
+            continue
+        results[name] = measure(render, texts, iterations)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "markdown": markdown.__version__,
+            "bleach": bleach.__version__,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list:
+    """Return rows of (class, metric, baseline, current, change %) for shared classes."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        for metric in ("renders_per_sec", "p50_ms", "p99_ms", "peak_kb"):
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            rows.append((name, metric, old, new, round((new - old) / old * 100, 1)))
+    return rows
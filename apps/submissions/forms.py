@@ -1,9 +1,19 @@
 from django import forms
+from django.core.validators import MaxLengthValidator
 from datetime import date
+import copy
 import json
 from jsonschema import Draft7Validator
 from taggit.forms import TagField
-from .models import Submission, strip_h1_h2
+from .markdown import max_length
+from .models import MARKDOWN_FIELDS, Submission, prepare_markdown
+
+
+def apply_max_length(field, limit):
+    """Enforce a character limit on a form field and mirror it on the widget."""
+    field.max_length = limit
+    field.validators.append(MaxLengthValidator(limit))
+    field.widget.attrs['maxlength'] = limit
 
 
 class SubmissionForm(forms.ModelForm):
@@ -75,6 +85,15 @@ class SubmissionForm(forms.ModelForm):
             'lessons': forms.Textarea(attrs={'rows': 3}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in MARKDOWN_FIELDS:
+            limit = max_length(name)
+            if limit:
+                apply_max_length(self.fields[name], limit)
+            # Picked up by static/js/preview.js
+            self.fields[name].widget.attrs['data-preview'] = name
+
     def clean_project_name(self):
         project_name = (self.cleaned_data.get('project_name') or '').strip()
         if len(project_name) > 120:
@@ -113,22 +132,22 @@ class SubmissionForm(forms.ModelForm):
         return y
 
     def clean_description(self):
-        return strip_h1_h2(self.cleaned_data.get('description', ''))
+        return prepare_markdown('description', self.cleaned_data.get('description', ''))
 
     def clean_idea(self):
-        return strip_h1_h2(self.cleaned_data.get('idea', ''))
+        return prepare_markdown('idea', self.cleaned_data.get('idea', ''))
 
     def clean_tech(self):
-        return strip_h1_h2(self.cleaned_data.get('tech', ''))
+        return prepare_markdown('tech', self.cleaned_data.get('tech', ''))
 
     def clean_wins(self):
-        return strip_h1_h2(self.cleaned_data.get('wins', ''))
+        return prepare_markdown('wins', self.cleaned_data.get('wins', ''))
 
     def clean_failure(self):
-        return strip_h1_h2(self.cleaned_data.get('failure', ''))
+        return prepare_markdown('failure', self.cleaned_data.get('failure', ''))
 
     def clean_lessons(self):
-        return strip_h1_h2(self.cleaned_data.get('lessons', ''))
+        return prepare_markdown('lessons', self.cleaned_data.get('lessons', ''))
 
     def clean_tags(self):
         tags = self.cleaned_data.get('tags') or []
@@ -200,6 +219,16 @@ SUBMISSION_IMPORT_SCHEMA = {
 }
 
 
+def build_import_schema() -> dict:
+    """Import schema with the configured markdown field limits applied."""
+    schema = copy.deepcopy(SUBMISSION_IMPORT_SCHEMA)
+    for name in MARKDOWN_FIELDS:
+        limit = max_length(name)
+        if limit:
+            schema["properties"][name]["maxLength"] = limit
+    return schema
+
+
 class SubmissionImportForm(forms.Form):
     json_data = forms.CharField(
         label="Submission JSON",
@@ -221,7 +250,7 @@ class SubmissionImportForm(forms.Form):
         else:
             raise forms.ValidationError("JSON must be an object or list of objects.")
 
-        validator = Draft7Validator(SUBMISSION_IMPORT_SCHEMA)
+        validator = Draft7Validator(build_import_schema())
         for idx, item in enumerate(items):
             errors = sorted(validator.iter_errors(item), key=lambda e: e.path)
             if errors:
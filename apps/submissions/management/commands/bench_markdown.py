@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.submissions import bench
+from apps.submissions.markdown import RENDERERS
+
+
+class Command(BaseCommand):
+    help = "Benchmark markdown rendering throughput, latency and memory per input class."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=5, help="Passes over each input class")
+        parser.add_argument("--size", type=int, default=20, help="Generated inputs per random class")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated corpus")
+        parser.add_argument(
+            "--profile", choices=sorted(RENDERERS), default="post", help="Renderer profile to benchmark"
+        )
+        parser.add_argument("--only", nargs="*", default=None, help="Input classes to run (default: all)")
+        parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this path")
+        parser.add_argument("--baseline", type=str, default=None, help="Compare against a saved JSON run")
+
+    def handle(self, *args, **opts):
+        corpus = bench.build_corpus(seed=opts["seed"], size=max(1, opts["size"]))
+        report = bench.run(
+            RENDERERS[opts["profile"]],
+            corpus,
+            iterations=max(1, opts["iterations"]),
+            classes=opts["only"],
+        )
+
+        report["meta"]["profile"] = opts["profile"]
+        self.stdout.write(f"{'class':<14}{'renders/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>11}")
+        for name, r in report["results"].items():
+            self.stdout.write(
+                f"{name:<14}{r['renders_per_sec']:>12}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['peak_kb']:>11}"
+            )
+
+        if opts["baseline"]:
+            with open(opts["baseline"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+            self.stdout.write("")
+            self.stdout.write("Change vs baseline:")
+            for name, metric, old, new, pct in bench.compare(report, baseline):
+                self.stdout.write(f"  {name:<14}{metric:<16}{old:>10} -> {new:<10} ({pct:+}%)")
+
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {opts['output']}"))
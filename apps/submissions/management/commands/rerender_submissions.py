@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.submissions.markdown import RENDERER_VERSION, render_markdown
+from apps.submissions.models import MARKDOWN_FIELDS, Submission
+
+
+def render_fields(item):
+    """Render one submission's markdown fields; runs inside a pool worker."""
+    pk, texts = item
+    htmls = render_markdown.render_many(texts.values())
+    return pk, {f"{field}_html": html for field, html in zip(texts, htmls)}
+
+
+class Command(BaseCommand):
+    help = "Backfill stored HTML for submissions rendered with an older renderer version."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of render processes (1 renders in-process)",
+        )
+        parser.add_argument("--batch-size", type=int, default=200, help="Rows written per UPDATE batch")
+        parser.add_argument("--all", action="store_true", help="Re-render every submission, not only stale ones")
+
+    def handle(self, *args, **opts):
+        workers = max(1, int(opts["workers"]))
+        batch_size = max(1, int(opts["batch_size"]))
+        qs = Submission.objects.all()
+        if not opts["all"]:
+            qs = qs.exclude(html_version=RENDERER_VERSION)
+        items = [
+            (row["pk"], {field: row[field] for field in MARKDOWN_FIELDS})
+            for row in qs.values("pk", *MARKDOWN_FIELDS).iterator()
+        ]
+        if not items:
+            self.stdout.write("Nothing to re-render.")
+            return
+
+        if workers == 1:
+            results = map(render_fields, items)
+            self._write(results, batch_size)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(render_fields, items, chunksize=max(1, len(items) // (workers * 4)))
+                self._write(results, batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f"Re-rendered {len(items)} submissions (renderer v{RENDERER_VERSION})."))
+
+    def _write(self, results, batch_size):
+        html_fields = [f"{field}_html" for field in MARKDOWN_FIELDS] + ["html_version"]
+        batch = []
+        for pk, values in results:
+            batch.append(Submission(pk=pk, html_version=RENDERER_VERSION, **values))
+            if len(batch) >= batch_size:
+                Submission.objects.bulk_update(batch, html_fields)
+                batch = []
+        if batch:
+            Submission.objects.bulk_update(batch, html_fields)
@@ -1,4 +1,13 @@
+import hashlib
+
+from django.conf import settings
+
 import markownify
+from apps.core.cache import LRUCache, get_or_compute
+
+# Bump whenever the output of render_markdown() changes (allowlists, extensions)
+# so stored HTML is picked up by `manage.py rerender_submissions`.
+RENDERER_VERSION = 3
 
 ALLOWED_TAGS = [
     'p', 'br', 'ul', 'ol', 'li', 'blockquote', 'code', 'pre', 'em', 'strong',
@@ -9,11 +18,151 @@ ALLOWED_ATTRS = {
 }
 ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
 
+# Comments: paragraphs, inline emphasis, code and links only
+COMMENT_ALLOWED_TAGS = ['p', 'br', 'em', 'strong', 'code', 'a']
+COMMENT_EXTENSIONS = ['nl2br']
+COMMENT_DISABLED_PROCESSORS = [
+    'indent', 'code', 'hashheader', 'setextheader', 'hr', 'olist', 'ulist', 'quote',
+    'image_link', 'image_reference', 'short_image_ref',
+]
+
+
+def max_length(field: str):
+    """Configured character limit for a markdown field (or 'comment')."""
+    return getattr(settings, 'MARKDOWN_MAX_LENGTHS', {}).get(field)
+
+
+render_markdown = markownify.Renderer(
+    tags=ALLOWED_TAGS,
+    attrs=ALLOWED_ATTRS,
+    protocols=ALLOWED_PROTOCOLS,
+)
+render_comment_markdown = markownify.Renderer(
+    tags=COMMENT_ALLOWED_TAGS,
+    attrs=ALLOWED_ATTRS,
+    protocols=ALLOWED_PROTOCOLS,
+    extensions=COMMENT_EXTENSIONS,
+    disable=COMMENT_DISABLED_PROCESSORS,
+)
+
+# Renderer profiles, selectable per call site
+RENDERERS = {
+    'post': render_markdown,
+    'comment': render_comment_markdown,
+}
+
+
+class BudgetExceeded(Exception):
+    """A guarded render ran out of time; `html` holds the escaped fallback."""
+
+    def __init__(self, html):
+        super().__init__('markdown render budget exceeded')
+        self.html = html
+
+
+class RenderCache:
+    """Content-addressed cache of rendered markdown.
+
+    Keys are a hash of the input text plus the renderer fingerprint and
+    RENDERER_VERSION, so identical text is shared across fields, submissions
+    and comments and never needs explicit invalidation. A bounded in-process
+    LRU sits in front of the shared Django cache, which is filled through
+    `get_or_compute` so a popular text is rendered by one worker at a time.
+    """
+
+    def __init__(self, renderer, maxsize=2048, timeout=7 * 24 * 60 * 60):
+        self.renderer = renderer
+        self.timeout = timeout
+        self.local = LRUCache(maxsize)
+        self.shared_hits = 0
+        self.misses = 0
+        self.prefix = f"md:{renderer.fingerprint}:{RENDERER_VERSION}"
+
+    def key(self, md_text: str) -> str:
+        digest = hashlib.sha256(md_text.encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    def render(self, md_text: str) -> str:
+        return self.render_checked(md_text)[0]
+
+    def render_checked(self, md_text: str):
+        """Return `(html, completed)`; `completed` is False for a budget fallback."""
+        if not md_text:
+            return "", True
+        key = self.key(md_text)
+        html = self.local.get(key)
+        if html is not None:
+            return html, True
+        rendered = []
+
+        def compute():
+            html = self._render(md_text)
+            rendered.append(html)
+            return html
+
+        try:
+            html = get_or_compute(key, compute, self.timeout)
+        except BudgetExceeded as exc:
+            # Do not pin the escaped fallback; a later render may succeed
+            return exc.html, False
+        if rendered:
+            self.misses += 1
+        else:
+            self.shared_hits += 1
+        self.local.set(key, html)
+        return html, True
+
+    def render_uncached(self, md_text: str) -> str:
+        """Render without touching either tier, for one-off texts such as drafts."""
+        try:
+            return self._render(md_text)
+        except BudgetExceeded as exc:
+            return exc.html
+
+    def _render(self, md_text: str) -> str:
+        budget = getattr(settings, 'MARKDOWN_RENDER_TIMEOUT', None)
+        if budget and len(md_text) >= getattr(settings, 'MARKDOWN_GUARD_MIN_LENGTH', 0):
+            html, completed = self.renderer.render_with_budget(md_text, budget)
+            if not completed:
+                raise BudgetExceeded(html)
+            return html
+        return self.renderer.render(md_text)
+
+    def stats(self) -> dict:
+        return {
+            "memory_hits": self.local.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "memory_entries": len(self.local),
+            "budget_exceeded": self.renderer.budget_exceeded,
+        }
+
+    def __call__(self, md_text: str) -> str:
+        return self.render(md_text)
+
+
+RENDER_CACHES = {name: RenderCache(renderer) for name, renderer in RENDERERS.items()}
+render_cache = RENDER_CACHES['post']
+
+
+def cached_render_markdown(md_text: str, profile: str = 'post') -> str:
+    return RENDER_CACHES[profile].render(md_text)
+
+
+def render_markdown_preview(md_text: str, profile: str = 'post') -> str:
+    """Render a draft for preview.
+
+    Drafts are rarely rendered twice, so they skip the render cache: with
+    its long timeout they would push page and query entries out of the
+    shared cache, which culls the entries closest to expiry first.
+    """
+    return RENDER_CACHES[profile].render_uncached(md_text)
+
+
+def cached_render_markdown_checked(md_text: str, profile: str = 'post'):
+    """Like cached_render_markdown() but returns `(html, completed)`.
 
-def render_markdown(md_text: str) -> str:
-    return markownify.render(
-        md_text,
-        tags=ALLOWED_TAGS,
-        attrs=ALLOWED_ATTRS,
-        protocols=ALLOWED_PROTOCOLS,
-    )
+    Callers that store the HTML use `completed` to keep the row stale when
+    only the escaped fallback could be produced.
+    """
+    return RENDER_CACHES[profile].render_checked(md_text)
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submissions", "0019_rename_stack_tags_to_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="description_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="failure_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="html_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="idea_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="lessons_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="tech_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="wins_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
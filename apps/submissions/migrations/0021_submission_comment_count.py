@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    Submission = apps.get_model("submissions", "Submission")
+    counts = (
+        Comment.objects.filter(submission=OuterRef("pk"), is_deleted=False)
+        .order_by()
+        .values("submission")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Submission.objects.update(comment_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0005_comment_path"),
+        ("submissions", "0020_store_rendered_html"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,10 @@ from taggit.managers import TaggableManager
 from datetime import date
 from django.core.validators import MinValueValidator
 
+from apps.core.models import DirtyFieldsMixin
+from .markdown import RENDERER_VERSION, cached_render_markdown_checked
+from .signals import submission_changed
+
 
 STATUS_CHOICES = (
     ('draft', 'Draft'),
@@ -16,6 +20,11 @@ STATUS_CHOICES = (
     ('removed', 'Removed'),
 )
 
+# Markdown fields that get a pre-rendered `<field>_html` companion column.
+MARKDOWN_FIELDS = ('description', 'idea', 'tech', 'wins', 'failure', 'lessons')
+# Columns list pages, the feed and the sitemap read; rows are cached by apps.core.query_cache
+LISTING_FIELDS = ('id', 'slug', 'project_name', 'tagline', 'comment_count', 'created_at', 'updated_at')
+
 
 def _short_id(length: int = 6) -> str:
     alphabet = string.ascii_lowercase + string.digits
@@ -35,11 +44,20 @@ def strip_h1_h2(md: str) -> str:
     return '\n'.join(lines)
 
 
+# Fields whose H1/H2 lines are stripped on save; `wins` keeps its headings
+HEADING_STRIPPED_FIELDS = ('description', 'idea', 'tech', 'failure', 'lessons')
+
+
+def prepare_markdown(field: str, md: str) -> str:
+    """The source of a markdown field as save() stores it, for rendering and preview."""
+    return strip_h1_h2(md) if field in HEADING_STRIPPED_FIELDS else md
+
+
 def current_year() -> int:
     return date.today().year
 
 
-class Submission(models.Model):
+class Submission(DirtyFieldsMixin, models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     project_name = models.CharField(max_length=120)
     slug = models.SlugField(max_length=200, unique=True, db_index=True)
@@ -55,6 +73,15 @@ class Submission(models.Model):
     lessons = models.TextField()
     wins = models.TextField(blank=True, default="")
 
+    # Sanitized HTML rendered on save; see render_html()
+    description_html = models.TextField(blank=True, default="", editable=False)
+    idea_html = models.TextField(blank=True, default="", editable=False)
+    tech_html = models.TextField(blank=True, default="", editable=False)
+    wins_html = models.TextField(blank=True, default="", editable=False)
+    failure_html = models.TextField(blank=True, default="", editable=False)
+    lessons_html = models.TextField(blank=True, default="", editable=False)
+    html_version = models.PositiveSmallIntegerField(default=0, editable=False)
+
     links_json = models.JSONField(default=list, blank=True)
     tags = TaggableManager(blank=True)
     # timeline_text removed for MVP
@@ -62,6 +89,8 @@ class Submission(models.Model):
     # spend_text removed for MVP
 
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='published', db_index=True)
+    # Comments not soft-deleted; maintained by apps.core.signals, repaired by `recount`
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -74,11 +103,53 @@ class Submission(models.Model):
     def get_absolute_url(self):
         return reverse('submission_detail', args=[self.slug])
 
+    @property
+    def html_is_stale(self) -> bool:
+        return self.html_version != RENDERER_VERSION
+
+    def render_html(self, fields=None) -> set:
+        """Render markdown fields (default: all) into their `<field>_html` columns.
+
+        Returns the names of the columns that were written. If any field only
+        got the escaped fallback of a render that ran out of budget,
+        `html_version` is left stale so the next read renders it again.
+        """
+        written = set()
+        completed = True
+        for field in MARKDOWN_FIELDS:
+            if fields is None or field in fields:
+                html, done = cached_render_markdown_checked(getattr(self, field))
+                setattr(self, f'{field}_html', html)
+                written.add(f'{field}_html')
+                completed = completed and done
+        if not completed:
+            self.html_version = 0
+            written.add('html_version')
+        elif fields is None:
+            self.html_version = RENDERER_VERSION
+            written.add('html_version')
+        return written
+
+    def refresh_html(self):
+        """Re-render stale HTML and persist it without bumping `updated_at`."""
+        written = self.render_html()
+        Submission.objects.filter(pk=self.pk).update(**{name: getattr(self, name) for name in written})
+        self._snapshot(written)
+
+    def rendered_html(self) -> dict:
+        return {field: getattr(self, f'{field}_html') for field in MARKDOWN_FIELDS}
+
     def save(self, *args, **kwargs):
+        created = self._state.adding
+        changed = self.get_dirty_fields()
+        if kwargs.get('update_fields') is not None:
+            changed &= set(kwargs['update_fields'])
+
         # enforce strip of H1/H2
-        markdown_fields = ['description', 'idea', 'tech', 'failure', 'lessons']
-        for field in markdown_fields:
-            setattr(self, field, strip_h1_h2(getattr(self, field)))
+        for field in MARKDOWN_FIELDS:
+            if field in changed:
+                setattr(self, field, prepare_markdown(field, getattr(self, field)))
+        changed |= self.render_html(None if self.html_is_stale else changed)
 
         if not self.slug:
             base = slugify(self.project_name)[:64] or 'post'
@@ -91,7 +162,22 @@ class Submission(models.Model):
                 sid = _short_id()
                 candidate = f"{base}-{sid}"
             self.slug = candidate
+            changed.add('slug')
+
+        previous = self.previous_values(changed)
+        if self.tracks_changes and not kwargs.get('force_insert'):
+            # Only write what changed; an unchanged instance skips the UPDATE
+            kwargs['update_fields'] = changed | {'updated_at'} if changed else []
         super().save(*args, **kwargs)
+        self._snapshot()
+        if changed:
+            submission_changed.send(
+                sender=Submission,
+                instance=self,
+                changed_fields=frozenset(changed),
+                created=created,
+                previous=previous,
+            )
 
 
 # Report model removed for MVP
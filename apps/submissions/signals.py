@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent after Submission.save() wrote at least one field.
+# Arguments: instance, changed_fields (frozenset of field names), created,
+# previous (loaded values of the changed fields, when the instance was tracked).
+submission_changed = Signal()
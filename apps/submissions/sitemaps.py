@@ -1,5 +1,6 @@
 from django.contrib.sitemaps import Sitemap
-from .models import Submission
+from apps.core.query_cache import cached_rows
+from .models import LISTING_FIELDS, Submission
 
 
 class SubmissionSitemap(Sitemap):
@@ -7,7 +8,8 @@ class SubmissionSitemap(Sitemap):
     priority = 0.6
 
     def items(self):
-        return Submission.objects.filter(status='published').order_by('-created_at')[:50]
+        latest = Submission.objects.filter(status='published').order_by('-created_at')[:50]
+        return cached_rows(latest, LISTING_FIELDS)
 
     def lastmod(self, obj: Submission):
         return obj.updated_at
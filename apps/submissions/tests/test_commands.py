@@ -0,0 +1,64 @@
+from pathlib import Path
+import sys
+import json
+import tempfile
+from io import StringIO
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.core.testing import make_submission
+from apps.submissions.markdown import RENDERER_VERSION
+from apps.submissions.models import Submission
+
+
+class RerenderSubmissionsCommandTests(TestCase):
+    def _create_submission(self, **overrides):
+        return make_submission(**{"project_name": "Backfill", "idea": "**idea**", **overrides})
+
+    def test_backfills_only_stale_rows(self):
+        stale = self._create_submission()
+        fresh = self._create_submission(project_name="Fresh")
+        Submission.objects.filter(pk=stale.pk).update(html_version=0, idea_html="")
+        Submission.objects.filter(pk=fresh.pk).update(idea_html="untouched")
+
+        out = StringIO()
+        call_command("rerender_submissions", workers=1, stdout=out)
+
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.html_version, RENDERER_VERSION)
+        self.assertIn("<strong>idea</strong>", stale.idea_html)
+        self.assertEqual(fresh.idea_html, "untouched")
+        self.assertIn("Re-rendered 1 submissions", out.getvalue())
+
+    def test_all_flag_rerenders_everything(self):
+        sub = self._create_submission()
+        Submission.objects.filter(pk=sub.pk).update(idea_html="")
+        call_command("rerender_submissions", workers=1, all=True, stdout=StringIO())
+        sub.refresh_from_db()
+        self.assertIn("<strong>idea</strong>", sub.idea_html)
+
+
+class BenchMarkdownCommandTests(TestCase):
+    def test_writes_json_and_compares_with_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bench.json"
+            call_command(
+                "bench_markdown", iterations=1, size=2, only=["fixture", "comment"],
+                output=str(path), stdout=StringIO(),
+            )
+            report = json.loads(path.read_text())
+            self.assertEqual(set(report["results"]), {"fixture", "comment"})
+            for result in report["results"].values():
+                self.assertGreater(result["renders_per_sec"], 0)
+                self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+
+            out = StringIO()
+            call_command(
+                "bench_markdown", iterations=1, size=2, only=["fixture"],
+                baseline=str(path), stdout=out,
+            )
+            self.assertIn("Change vs baseline", out.getvalue())
@@ -3,9 +3,11 @@ import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
-from django.test import TestCase
+import json
 
-from apps.submissions.forms import SubmissionForm
+from django.test import TestCase, override_settings
+
+from apps.submissions.forms import SubmissionForm, SubmissionImportForm
 from datetime import date
 
 
@@ -49,3 +51,18 @@ class SubmissionFormTests(TestCase):
         form = SubmissionForm(data)
         self.assertTrue(form.is_valid())
         self.assertCountEqual(form.cleaned_data["tags"], ["python", "django"])
+
+    @override_settings(MARKDOWN_MAX_LENGTHS={"idea": 10})
+    def test_markdown_field_length_limit(self):
+        form = SubmissionForm(self._valid_data(idea="x" * 11))
+        self.assertFalse(form.is_valid())
+        self.assertIn("idea", form.errors)
+        self.assertEqual(form.fields["idea"].widget.attrs["maxlength"], 10)
+        self.assertTrue(SubmissionForm(self._valid_data(idea="x" * 10)).is_valid())
+
+    @override_settings(MARKDOWN_MAX_LENGTHS={"tech": 10})
+    def test_import_schema_length_limit(self):
+        item = self._valid_data(tech="x" * 11)
+        form = SubmissionImportForm({"json_data": json.dumps(item)})
+        self.assertFalse(form.is_valid())
+        self.assertIn("tech", str(form.errors))
@@ -1,8 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[3]))
-from apps.submissions.markdown import render_markdown
+from apps.submissions.markdown import render_comment_markdown, render_markdown
 
 
 def test_adds_rel_when_missing():
@@ -43,3 +44,100 @@ def test_disallowed_protocol_removed():
     assert 'href' not in html
     assert '<a rel="nofollow noopener">bad</a>' in html
 
+
+
+def test_renderer_does_not_leak_state_between_calls():
+    first = render_markdown("[x][1]\n\n[1]: https://example.com")
+    assert 'href="https://example.com"' in first
+    second = render_markdown("[x][1]")
+    assert 'href' not in second
+
+
+def test_render_many_matches_render():
+    texts = ["**a**", "", "- one\n- two", "[l](https://example.com)"]
+    assert render_markdown.render_many(texts) == [render_markdown(t) for t in texts]
+
+
+def test_renderer_thread_local_pipelines():
+    from concurrent.futures import ThreadPoolExecutor
+
+    texts = [f"*item {i}*" for i in range(50)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(render_markdown, texts))
+    assert results == [f"<p><em>item {i}</em></p>" for i in range(50)]
+
+
+def test_rel_not_confused_by_attribute_values():
+    html = render_markdown('<a href="https://example.com" title="rel=x">t</a>')
+    assert 'rel="nofollow noopener"' in html
+
+
+def test_link_target_and_text_limit():
+    import markownify
+
+    renderer = markownify.Renderer(target='_blank', max_link_text=10)
+    html = renderer.render('[a very long link text](https://example.com) after')
+    assert html == (
+        '<p><a href="https://example.com" rel="nofollow noopener" target="_blank">'
+        'a very lon...</a> after</p>'
+    )
+
+
+def test_render_with_budget_completes():
+    html, completed = render_markdown.render_with_budget("**fast**", timeout=30)
+    assert completed
+    assert html == "<p><strong>fast</strong></p>"
+
+
+def test_render_with_budget_does_not_count_worker_startup():
+    import markownify
+
+    renderer = markownify.Renderer()
+    # A cold spawn takes far longer than this; only the render is timed
+    assert renderer.render_with_budget("**cold**", timeout=0.05) == ("<p><strong>cold</strong></p>", True)
+    assert len(renderer._workers) == 1
+
+
+def test_render_with_budget_falls_back_to_escaped_text():
+    import markownify
+
+    renderer = markownify.Renderer()
+    text = "<b>x</b> " + "- " * 5000 + "\n" + "*a **b " * 5000
+    html, completed = renderer.render_with_budget(text, timeout=0.001)
+    assert not completed
+    assert html.startswith("<p>&lt;b&gt;x&lt;/b&gt;")
+    assert renderer.budget_exceeded == 1
+
+
+def test_render_with_budget_timeout_spares_concurrent_renders():
+    import markownify
+
+    renderer = markownify.Renderer()
+    # Unclosed brackets make the link pattern backtrack for over a minute
+    slow = "[" * 20000 + "a"
+    with ThreadPoolExecutor(2) as executor:
+        timed_out = executor.submit(renderer.render_with_budget, slow, 1)
+        fast = executor.submit(renderer.render_with_budget, "**fast**", 30)
+        assert fast.result() == ("<p><strong>fast</strong></p>", True)
+        assert timed_out.result()[1] is False
+    assert renderer.budget_exceeded == 1
+
+
+def test_comment_profile_renders_inline_markup():
+    html = render_comment_markdown("*em* **strong** `code` [l](https://example.com)")
+    assert html == (
+        '<p><em>em</em> <strong>strong</strong> <code>code</code> '
+        '<a href="https://example.com" rel="nofollow noopener">l</a></p>'
+    )
+
+
+def test_comment_profile_skips_block_markup():
+    html = render_comment_markdown("### title\n- item\n> quote")
+    assert '<h3>' not in html
+    assert '<li>' not in html
+    assert '<blockquote>' not in html
+    assert 'title' in html and 'item' in html and 'quote' in html
+
+
+def test_profiles_have_distinct_fingerprints():
+    assert render_comment_markdown.fingerprint != render_markdown.fingerprint
@@ -4,9 +4,13 @@ from unittest.mock import patch
 
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
+from apps.submissions.markdown import RENDERER_VERSION
 from apps.submissions.models import Submission, strip_h1_h2
+from apps.submissions.signals import submission_changed
 
 
 class StripH1H2Tests(TestCase):
@@ -40,3 +44,113 @@ class SubmissionSlugTests(TestCase):
         self.assertEqual(first.slug, "same-name-abc123")
         self.assertEqual(second.slug, "same-name-def456")
         self.assertNotEqual(first.slug, second.slug)
+
+
+class SubmissionRenderedHtmlTests(TestCase):
+    def test_save_stores_rendered_html_with_version(self):
+        sub = Submission.objects.create(
+            project_name="Rendered",
+            tagline="t",
+            idea="**idea**",
+            tech="tech",
+            failure="fail",
+            lessons="[link](https://example.com)",
+        )
+        sub.refresh_from_db()
+        self.assertEqual(sub.html_version, RENDERER_VERSION)
+        self.assertIn("<strong>idea</strong>", sub.idea_html)
+        self.assertIn('rel="nofollow noopener"', sub.lessons_html)
+        self.assertEqual(sub.wins_html, "")
+
+    def test_refresh_html_keeps_updated_at(self):
+        sub = Submission.objects.create(
+            project_name="Stale",
+            tagline="t",
+            idea="*idea*",
+            tech="tech",
+            failure="fail",
+            lessons="lessons",
+        )
+        Submission.objects.filter(pk=sub.pk).update(html_version=0, idea_html="")
+        sub.refresh_from_db()
+        updated_at = sub.updated_at
+        self.assertTrue(sub.html_is_stale)
+        sub.refresh_html()
+        sub.refresh_from_db()
+        self.assertFalse(sub.html_is_stale)
+        self.assertIn("<em>idea</em>", sub.idea_html)
+        self.assertEqual(sub.updated_at, updated_at)
+
+    @override_settings(MARKDOWN_RENDER_TIMEOUT=0.001, MARKDOWN_GUARD_MIN_LENGTH=100)
+    def test_budget_fallback_leaves_html_stale(self):
+        sub = Submission.objects.create(
+            project_name="Slow",
+            tagline="t",
+            idea="*c **d " * 5000,
+            tech="tech",
+            failure="fail",
+            lessons="lessons",
+        )
+        sub.refresh_from_db()
+        self.assertTrue(sub.idea_html.startswith("<p>*c **d"))
+        self.assertTrue(sub.html_is_stale)
+
+        # A partial re-render that falls back marks current HTML stale too
+        Submission.objects.filter(pk=sub.pk).update(html_version=RENDERER_VERSION)
+        sub.refresh_from_db()
+        sub.tech = "*e **f " * 5000
+        sub.save()
+        sub.refresh_from_db()
+        self.assertTrue(sub.html_is_stale)
+
+
+class SubmissionDirtyFieldsTests(TestCase):
+    def setUp(self):
+        self.sub = Submission.objects.create(
+            project_name="Dirty",
+            tagline="t",
+            idea="idea",
+            tech="tech",
+            failure="fail",
+            lessons="lessons",
+        )
+        self.sub = Submission.objects.get(pk=self.sub.pk)
+
+    def test_tracks_changed_fields_since_load(self):
+        self.assertEqual(self.sub.get_dirty_fields(), set())
+        self.sub.idea = "# Heading\n*new idea*"
+        self.sub.status = "flagged"
+        self.assertEqual(self.sub.get_dirty_fields(), {"idea", "status"})
+
+    def test_update_writes_only_changed_columns(self):
+        self.sub.idea = "# Heading\n*new idea*"
+        with CaptureQueriesContext(connection) as ctx:
+            self.sub.save()
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"idea_html"', updates[0])
+        self.assertNotIn('"tech_html"', updates[0])
+        self.assertNotIn('"lessons"', updates[0])
+        self.sub.refresh_from_db()
+        self.assertEqual(self.sub.idea, "*new idea*")
+        self.assertIn("<em>new idea</em>", self.sub.idea_html)
+        self.assertEqual(self.sub.get_dirty_fields(), set())
+
+    def test_unchanged_save_skips_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.sub.save()
+        self.assertEqual(ctx.captured_queries, [])
+
+    def test_signal_reports_changed_fields(self):
+        received = []
+
+        def handler(sender, instance, changed_fields, created, **kwargs):
+            received.append((changed_fields, created))
+
+        submission_changed.connect(handler)
+        try:
+            self.sub.tagline = "new tagline"
+            self.sub.save()
+        finally:
+            submission_changed.disconnect(handler)
+        self.assertEqual(received, [(frozenset({"tagline"}), False)])
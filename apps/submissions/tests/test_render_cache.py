@@ -0,0 +1,51 @@
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+import markownify
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.submissions.markdown import RenderCache, render_markdown
+
+
+class RenderCacheTests(TestCase):
+    def setUp(self):
+        self.render_cache = RenderCache(render_markdown, maxsize=8)
+        self.text = "**cached** render test"
+        cache.delete(self.render_cache.key(self.text))
+
+    def test_key_depends_on_text_and_renderer(self):
+        self.assertEqual(self.render_cache.key("a"), self.render_cache.key("a"))
+        self.assertNotEqual(self.render_cache.key("a"), self.render_cache.key("b"))
+        self.assertIn(render_markdown.fingerprint, self.render_cache.key("a"))
+
+    def test_renders_once_then_hits_memory_and_shared_tiers(self):
+        with patch.object(render_markdown, "render", wraps=render_markdown.render) as render:
+            html = self.render_cache.render(self.text)
+            self.assertEqual(html, "<p><strong>cached</strong> render test</p>")
+            self.render_cache.render(self.text)
+            self.render_cache.local.clear()
+            self.render_cache.render(self.text)
+        self.assertEqual(render.call_count, 1)
+        stats = self.render_cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["shared_hits"], 1)
+
+    def test_empty_text_skips_cache(self):
+        self.assertEqual(self.render_cache.render(""), "")
+        self.assertEqual(self.render_cache.stats()["misses"], 0)
+
+
+    @override_settings(MARKDOWN_RENDER_TIMEOUT=0.001, MARKDOWN_GUARD_MIN_LENGTH=100)
+    def test_budget_exceeded_falls_back_without_caching(self):
+        render_cache = RenderCache(markownify.Renderer())
+        text = "*a **b " * 5000
+        html = render_cache.render(text)
+        self.assertTrue(html.startswith("<p>*a **b"))
+        self.assertEqual(render_cache.stats()["budget_exceeded"], 1)
+        self.assertIsNone(cache.get(render_cache.key(text)))
+        self.assertEqual(len(render_cache.local), 0)
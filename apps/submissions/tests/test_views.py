@@ -5,10 +5,13 @@ import json
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
 from datetime import date
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
+from apps.core.testing import LOCMEM_CACHE
+from apps.submissions.markdown import render_cache
 from apps.submissions.models import Submission
 
 
@@ -92,3 +95,154 @@ class ImportViewTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, "Invalid JSON")
 
+
+
+class SubmissionDetailViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="author", password="pw"
+        )
+
+    def test_detail_uses_stored_html(self):
+        sub = Submission.objects.create(
+            user=self.user,
+            project_name="Detail",
+            tagline="t",
+            idea="idea",
+            tech="tech",
+            failure="fail",
+            lessons="lessons",
+        )
+        Submission.objects.filter(pk=sub.pk).update(idea_html="<p>stored</p>")
+        resp = self.client.get(sub.get_absolute_url())
+        self.assertContains(resp, "<p>stored</p>")
+
+    def test_detail_renders_stale_rows(self):
+        sub = Submission.objects.create(
+            user=self.user,
+            project_name="Detail",
+            tagline="t",
+            idea="*idea*",
+            tech="tech",
+            failure="fail",
+            lessons="lessons",
+        )
+        Submission.objects.filter(pk=sub.pk).update(html_version=0, idea_html="")
+        resp = self.client.get(sub.get_absolute_url())
+        self.assertContains(resp, "<em>idea</em>")
+        sub.refresh_from_db()
+        self.assertFalse(sub.html_is_stale)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, MARKDOWN_PREVIEW_RATE=(3, 60))
+class MarkdownPreviewViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="previewer", password="pw"
+        )
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse("markdown_preview")
+
+    def test_renders_fragment(self):
+        resp = self.client.post(self.url, {"field": "idea", "text": "# Gone\n**bold**"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content.decode(), "<p><strong>bold</strong></p>")
+
+    def test_drafts_skip_the_render_cache(self):
+        text = "**draft** only"
+        self.client.post(self.url, {"field": "idea", "text": text})
+        self.assertIsNone(cache.get(render_cache.key(text)))
+        self.assertNotIn(render_cache.key(text), render_cache.local)
+
+    def test_matches_saved_html_per_field(self):
+        text = "## Kept\n**bold**"
+        sub = Submission.objects.create(
+            project_name="Preview", tagline="t", idea=text, tech="t", failure="f", lessons="l", wins=text
+        )
+        for field in ("idea", "wins"):
+            resp = self.client.post(self.url, {"field": field, "text": text})
+            self.assertEqual(resp.content.decode(), getattr(sub, f"{field}_html"))
+
+    def test_rejects_unknown_field(self):
+        resp = self.client.post(self.url, {"field": "tagline", "text": "x"})
+        self.assertEqual(resp.status_code, 400)
+
+    @override_settings(MARKDOWN_MAX_LENGTHS={"idea": 3})
+    def test_rejects_text_over_limit(self):
+        resp = self.client.post(self.url, {"field": "idea", "text": "xxxx"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_requires_login(self):
+        self.client.logout()
+        resp = self.client.post(self.url, {"field": "idea", "text": "x"})
+        self.assertEqual(resp.status_code, 302)
+
+    def test_rate_limited_per_user(self):
+        for _ in range(3):
+            self.assertEqual(self.client.post(self.url, {"field": "idea", "text": "x"}).status_code, 200)
+        resp = self.client.post(self.url, {"field": "idea", "text": "x"})
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(resp["Retry-After"], "60")
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=0, FRAGMENT_CACHE_TIMEOUT=0)
+class CommentThreadQueryTests(TestCase):
+    def setUp(self):
+        from apps.comments.models import Comment
+
+        self.Comment = Comment
+        self.user = get_user_model().objects.create_user(username="author", password="pw")
+        self.sub = Submission.objects.create(
+            user=self.user,
+            project_name="Thread",
+            tagline="t",
+            idea="idea",
+            tech="tech",
+            failure="fail",
+            lessons="lessons",
+            status="published",
+        )
+
+    def _reply_chain(self, length, parent=None):
+        for i in range(length):
+            # A distinct author per comment exposes per-comment user lookups
+            user = get_user_model().objects.create_user(
+                username=f"u{self.Comment.objects.count()}"
+            )
+            parent = self.Comment.objects.create(
+                user=user, submission=self.sub, parent=parent, content=f"reply {i}"
+            )
+        return parent
+
+    def _queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.sub.get_absolute_url())
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx), resp
+
+    def test_query_count_independent_of_thread_size(self):
+        self._reply_chain(2)
+        small, _ = self._queries()
+        root = self._reply_chain(1)
+        self._reply_chain(10, parent=root)
+        self._reply_chain(5)
+        large, resp = self._queries()
+        self.assertEqual(small, large)
+        self.assertContains(resp, 'class="comment"', count=2 + 1 + 10 + 5)
+
+    def test_replies_nested_in_order(self):
+        top = self.Comment.objects.create(user=self.user, submission=self.sub, content="top")
+        first = self.Comment.objects.create(
+            user=self.user, submission=self.sub, parent=top, content="first"
+        )
+        second = self.Comment.objects.create(
+            user=self.user, submission=self.sub, parent=top, content="second"
+        )
+        thread = self.sub.comments.thread()
+        self.assertEqual(thread, [top])
+        self.assertEqual(thread[0].children, [first, second])
+        self.assertEqual(thread[0].children[0].children, [])
@@ -1,5 +1,8 @@
 from django.urls import path
-from .views import SubmissionDetailView, SubmitView, LatestFeed, DeleteSubmissionView, SubmissionImportView
+from .views import (
+    SubmissionDetailView, SubmitView, latest_feed, DeleteSubmissionView, SubmissionImportView,
+    MarkdownPreviewView,
+)
 
 urlpatterns = [
     path('p/<slug:slug>/', SubmissionDetailView.as_view(), name='submission_detail'),
@@ -7,5 +10,6 @@ urlpatterns = [
     path('submit/', SubmitView.as_view(), name='submit'),
     path('submit/<slug:slug>/', SubmitView.as_view(), name='submit_edit'),
     path('import/', SubmissionImportView.as_view(), name='submission_import'),
-    path('rss.xml', LatestFeed(), name='rss'),
+    path('preview/', MarkdownPreviewView.as_view(), name='markdown_preview'),
+    path('rss.xml', latest_feed, name='rss'),
 ]
@@ -1,22 +1,58 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Count, Max
+from django.http import HttpResponse, HttpResponseBadRequest
 from django.shortcuts import redirect
 from django.views.generic import DetailView, FormView, View
 from django.contrib.syndication.views import Feed
 from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 from django.contrib import messages
 
-from .models import Submission
+from apps.core.cache import hit_rate_limit
+from apps.core.conditional import conditional_page, published_signature
+from apps.core.models import AuthorStats
+from apps.core.page_cache import CachedPageMixin, cache_page_view
+from apps.core.query_cache import cached_rows
+from .models import LISTING_FIELDS, MARKDOWN_FIELDS, Submission, prepare_markdown
 from .forms import SubmissionForm, SubmissionImportForm
-from .markdown import render_markdown
-from django.core.cache import cache
-
-
-class SubmissionDetailView(DetailView):
+from .markdown import max_length, render_markdown_preview
+
+
+def detail_validator(request, slug):
+    row = (
+        Submission.objects.filter(slug=slug, status="published")
+        .annotate(last_comment=Max("comments__updated_at"), comments_total=Count("comments"))
+        .values_list("updated_at", "last_comment", "comments_total")
+        .first()
+    )
+    if row is None:
+        return None
+    updated_at, last_comment, comment_count = row
+    parts = (comment_count,)
+    if request.user.is_authenticated:
+        # The comment form is offered only to users with a published submission
+        parts += (AuthorStats.objects.has_published(request.user),)
+    return max(filter(None, (updated_at, last_comment))), parts
+
+
+def published_validator(request, *args, **kwargs):
+    # The feed and sitemap do not show comment counts
+    last, count, _ = published_signature(Submission.objects.filter(status="published"))
+    return last, (count,)
+
+
+@method_decorator(conditional_page(detail_validator), name="dispatch")
+class SubmissionDetailView(CachedPageMixin, DetailView):
     model = Submission
     template_name = "submissions/detail.html"
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def page_cache_namespaces(self):
+        return [f"submission:{self.kwargs['slug']}"]
+
     def get_queryset(self):
         qs = super().get_queryset()
         return qs.filter(status="published")
@@ -27,35 +63,21 @@ class SubmissionDetailView(DetailView):
         if not hasattr(self, "_can_comment_cache"):
             self._can_comment_cache = {}
         if user.pk not in self._can_comment_cache:
-            self._can_comment_cache[user.pk] = Submission.objects.filter(
-                user=user
-            ).exists()
+            self._can_comment_cache[user.pk] = AuthorStats.objects.has_published(user)
         return self._can_comment_cache[user.pk]
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         s = self.object
 
-        # Cache rendered markdown per-field, invalidated on update
-        def _md(field_name: str, text: str) -> str:
-            key = f"md:{field_name}:{s.pk}:{int(s.updated_at.timestamp())}"
-            html = cache.get(key)
-            if html is None:
-                html = render_markdown(text)
-                cache.set(key, html, 12 * 60 * 60)  # 12 hours
-            return html
-
-        ctx["html"] = {
-            "description": _md("description", s.description),
-            "idea": _md("idea", s.idea),
-            "tech": _md("tech", s.tech),
-            "wins": _md("wins", s.wins),
-            "failure": _md("failure", s.failure),
-            "lessons": _md("lessons", s.lessons),
-        }
+        # HTML is rendered on save; only rows missed by a backfill render here
+        if s.html_is_stale:
+            s.refresh_html()
+        ctx["html"] = s.rendered_html()
 
         ctx["can_comment"] = self._user_can_comment(self.request.user)
-        ctx["comments"] = s.comments.select_related("user").filter(parent__isnull=True)
+        # Lazy so a cached comment fragment skips the query entirely
+        ctx["comments"] = SimpleLazyObject(lambda: list(s.comments.display_order()))
         return ctx
 
 
@@ -95,6 +117,26 @@ class SubmitView(LoginRequiredMixin, FormView):
         return redirect(s.get_absolute_url())
 
 
+class MarkdownPreviewView(LoginRequiredMixin, View):
+    """Render one submit-form field and return the HTML fragment."""
+
+    def post(self, request):
+        limit, period = getattr(settings, "MARKDOWN_PREVIEW_RATE", (30, 60))
+        if hit_rate_limit(f"preview:{request.user.pk}", limit, period):
+            response = HttpResponse("Too many preview requests.", status=429)
+            response["Retry-After"] = str(period)
+            return response
+
+        field = request.POST.get("field", "")
+        text = request.POST.get("text", "")
+        if field not in MARKDOWN_FIELDS:
+            return HttpResponseBadRequest("Unknown field.")
+        limit = max_length(field)
+        if limit and len(text) > limit:
+            return HttpResponseBadRequest(f"Text exceeds {limit} characters.")
+        return HttpResponse(render_markdown_preview(prepare_markdown(field, text)))
+
+
 class SubmissionImportView(LoginRequiredMixin, FormView):
     template_name = "submissions/import.html"
     form_class = SubmissionImportForm
@@ -123,9 +165,8 @@ class LatestFeed(Feed):
     description = "Latest 50 posts"
 
     def items(self):
-        return Submission.objects.filter(status="published").order_by("-created_at")[
-            :50
-        ]
+        latest = Submission.objects.filter(status="published").order_by("-created_at")[:50]
+        return cached_rows(latest, LISTING_FIELDS)
 
     def item_title(self, item: Submission):
         return item.project_name
@@ -137,6 +178,11 @@ class LatestFeed(Feed):
         return reverse("submission_detail", args=[item.slug])
 
 
+latest_feed = conditional_page(published_validator, per_user=False)(
+    cache_page_view("published")(LatestFeed())
+)
+
+
 class DeleteSubmissionView(LoginRequiredMixin, View):
     def post(self, request, slug):
         try:
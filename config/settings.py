@@ -125,6 +125,23 @@ SITE_NAME = env('SITE_NAME', default='miserableprojects.directory')
 DEFAULT_OG_IMAGE = env('MISERABLEPROJECT_DEFAULT_OG_IMAGE', default=env('DEFAULT_OG_IMAGE', default='/static/img/og-placeholder.svg'))
 GOOGLE_ANALYTICS_ID = env('GOOGLE_ANALYTICS_ID', default='')
 
+# Markdown input limits (characters per field) and render budget.
+# Texts of at least MARKDOWN_GUARD_MIN_LENGTH characters render in a worker
+# process and fall back to escaped plain text after MARKDOWN_RENDER_TIMEOUT seconds.
+MARKDOWN_MAX_LENGTHS = {
+    'description': 5000,
+    'idea': 20000,
+    'tech': 20000,
+    'wins': 20000,
+    'failure': 20000,
+    'lessons': 20000,
+    'comment': 5000,
+}
+MARKDOWN_RENDER_TIMEOUT = env.float('MARKDOWN_RENDER_TIMEOUT', default=2.0)
+MARKDOWN_GUARD_MIN_LENGTH = 2000
+# Live preview on the submit form: requests allowed per user per window (seconds)
+MARKDOWN_PREVIEW_RATE = (30, 60)
+
 # Email/Anymail configuration
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='no-reply@miserableprojects.directory')
@@ -153,11 +170,26 @@ except Exception:
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        # Per-worker memory LRU over the shared file cache; see apps/core/cache_backends.py
+        'BACKEND': 'apps.core.cache_backends.TwoTierCache',
         'LOCATION': str(CACHE_DIR),
         'TIMEOUT': 300,  # 5 minutes default TTL
         'OPTIONS': {
-            'MAX_ENTRIES': 10000,
+            'SHARED_BACKEND': 'apps.core.cache_backends.SQLiteCache',
+            'SHARED_OPTIONS': {
+                'MAX_ENTRIES': 10000,
+            },
+            'MEMORY_MAX_ENTRIES': 1000,
+            'MEMORY_TIMEOUT': 30,
         },
     }
 }
+
+# Anonymous page cache for home, tag, profile and detail pages (seconds, 0 disables)
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=600)
+# Cached listing rows and counts (apps/core/query_cache.py); 0 disables
+QUERY_CACHE_TIMEOUT = env.int('QUERY_CACHE_TIMEOUT', default=300)
+# Show the cached "N posts" total on cursor-paginated tag and profile pages
+LISTING_SHOW_TOTAL = True
+# {% fragment_cache %} blocks (tag nav, comment threads); 0 disables
+FRAGMENT_CACHE_TIMEOUT = 600
@@ -5,7 +5,10 @@ from django.views.generic.base import RedirectView
 from django.views.generic import TemplateView
 from django.conf import settings
 
+from apps.core.conditional import conditional_page
+from apps.core.page_cache import cache_page_view
 from apps.submissions.sitemaps import SubmissionSitemap
+from apps.submissions.views import published_validator
 from apps.core.views import SignupView
 
 sitemaps = {
@@ -24,5 +27,10 @@ urlpatterns = [
     path("", include("apps.core.urls")),
     path("", include("apps.submissions.urls")),
     path("comments/", include("apps.comments.urls")),
-    path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="sitemap"),
+    path(
+        "sitemap.xml",
+        conditional_page(published_validator, per_user=False)(cache_page_view("published")(sitemap)),
+        {"sitemaps": sitemaps},
+        name="sitemap",
+    ),
 ]
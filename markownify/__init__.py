@@ -1,6 +1,14 @@
+import atexit
+import hashlib
+import html
+import logging
+import multiprocessing
+import threading
+from functools import partial
+
 import markdown as _md
-import bleach
-import re
+from bleach.html5lib_shim import Filter
+from bleach.sanitizer import Cleaner
 
 DEFAULT_TAGS = [
     'p', 'br', 'ul', 'ol', 'li', 'blockquote', 'code', 'pre', 'em', 'strong',
@@ -10,24 +18,253 @@ DEFAULT_ATTRS = {
     'a': ['href', 'title', 'rel'],
 }
 DEFAULT_PROTOCOLS = ['http', 'https', 'mailto']
+DEFAULT_EXTENSIONS = ['extra', 'sane_lists', 'nl2br']
+DEFAULT_REL = 'nofollow noopener'
+
+logger = logging.getLogger(__name__)
+
+_REL = (None, 'rel')
+_TARGET = (None, 'target')
+
+
+class LinkAttributesFilter(Filter):
+    """Set link attributes while the sanitizer walks the token stream.
+
+    Adds `rel` (and `target`, when given) to `<a>` tags that lack one and
+    optionally truncates link text to `max_text_length` characters.
+    """
+
+    def __init__(self, source, rel=DEFAULT_REL, target=None, max_text_length=None):
+        super().__init__(source)
+        self.rel = rel
+        self.target = target
+        self.max_text_length = max_text_length
+
+    def __iter__(self):
+        remaining = None
+        for token in self.source:
+            token_type = token['type']
+            if token_type == 'StartTag' and token['name'] == 'a':
+                attrs = token['data']
+                if self.rel and _REL not in attrs:
+                    attrs[_REL] = self.rel
+                if self.target and _TARGET not in attrs:
+                    attrs[_TARGET] = self.target
+                remaining = self.max_text_length
+            elif token_type == 'EndTag' and token['name'] == 'a':
+                remaining = None
+            elif remaining is not None and token_type in ('Characters', 'SpaceCharacters'):
+                # remaining == -1 marks link text that was already cut short
+                if remaining < 0:
+                    continue
+                text = token['data']
+                if len(text) > remaining:
+                    token['data'] = text[:remaining] + '...'
+                    remaining = -1
+                else:
+                    remaining -= len(text)
+            yield token
+
+
+class Renderer:
+    """Render markdown text to sanitized HTML with a fixed configuration.
+
+    The markdown parser and bleach cleaner are built once and reused. Neither
+    is thread-safe, so every thread gets its own pair, created on first use.
+    """
+
+    # Guarded-render worker processes, kept alive between render_with_budget() calls
+    max_workers = 4
+    # Seconds a new worker may take to start, outside the render budget
+    worker_start_timeout = 30
+
+    def __init__(self, *, tags=None, attrs=None, protocols=None, extensions=None,
+                 disable=(), rel=DEFAULT_REL, target=None, max_link_text=None):
+        self.tags = list(tags or DEFAULT_TAGS)
+        self.attrs = dict(attrs or DEFAULT_ATTRS)
+        self.protocols = list(protocols or DEFAULT_PROTOCOLS)
+        self.extensions = list(DEFAULT_EXTENSIONS if extensions is None else extensions)
+        # Names of python-markdown processors/patterns to deregister
+        self.disable = list(disable)
+        self.link_filter = partial(
+            LinkAttributesFilter, rel=rel, target=target, max_text_length=max_link_text
+        )
+        config = repr((
+            sorted(self.tags),
+            sorted((tag, sorted(names)) for tag, names in self.attrs.items()),
+            sorted(self.protocols),
+            self.extensions,
+            sorted(self.disable),
+            rel, target, max_link_text,
+        ))
+        # Short digest of the configuration, for cache keys of rendered output
+        self.fingerprint = hashlib.sha1(config.encode()).hexdigest()[:12]
+        self.budget_exceeded = 0
+        self._local = threading.local()
+        # Idle single-process pools for render_with_budget(); the semaphore bounds them all
+        self._workers = []
+        self._workers_lock = threading.Lock()
+        self._worker_slots = threading.BoundedSemaphore(self.max_workers)
+        self._workers_started = False
+
+    def __getstate__(self):
+        # Only the configuration travels to guarded-render workers
+        state = self.__dict__.copy()
+        for name in ('_local', '_workers', '_workers_lock', '_worker_slots'):
+            state.pop(name)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._workers = []
+        self._workers_lock = threading.Lock()
+        self._worker_slots = threading.BoundedSemaphore(self.max_workers)
+        self._workers_started = False
+
+    def _pipeline(self):
+        local = self._local
+        md = getattr(local, 'md', None)
+        if md is None:
+            md = local.md = _md.Markdown(extensions=self.extensions)
+            registries = (
+                md.preprocessors, md.parser.blockprocessors, md.inlinePatterns,
+                md.treeprocessors, md.postprocessors,
+            )
+            for name in self.disable:
+                for registry in registries:
+                    if name in registry:
+                        registry.deregister(name)
+            local.cleaner = Cleaner(
+                tags=self.tags,
+                attributes=self.attrs,
+                protocols=self.protocols,
+                strip=True,
+                filters=[self.link_filter],
+            )
+        return md, local.cleaner
+
+    def render(self, md_text: str) -> str:
+        """Render markdown text to sanitized HTML."""
+        if not md_text:
+            return ''
+        md, cleaner = self._pipeline()
+        return cleaner.clean(md.reset().convert(md_text))
+
+    def render_with_budget(self, md_text: str, timeout: float):
+        """Render in a worker process, giving up after `timeout` seconds.
+
+        Returns `(html, completed)`. When the budget is exceeded the worker is
+        killed and the text comes back escaped, wrapped in a paragraph.
+
+        Workers come from a pool of at most `max_workers` single-process
+        pools, so a timeout kills only the worker running that text; callers
+        past the limit wait for a free worker. The budget starts once the
+        worker has started and built its pipeline, and a killed worker is
+        replaced by a fresh one that warms up in the background.
+        """
+        if not md_text:
+            return '', True
+        worker = self._checkout_worker()
+        try:
+            return worker.apply_async(_render_in_worker, (self, md_text)).get(timeout), True
+        except multiprocessing.TimeoutError:
+            worker.terminate()
+            worker = None
+            worker = self._start_worker()
+            with self._workers_lock:
+                self.budget_exceeded += 1
+            logger.warning('Markdown render exceeded %.2fs budget (%d chars)', timeout, len(md_text))
+            return escape_plain(md_text), False
+        finally:
+            self._checkin_worker(worker)
+
+    def close_workers(self):
+        """Terminate idle guarded-render workers; runs at interpreter exit."""
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.terminate()
+
+    def _start_worker(self):
+        if not self._workers_started:
+            self._workers_started = True
+            atexit.register(self.close_workers)
+        worker = multiprocessing.get_context('spawn').Pool(1)
+        worker.ready = worker.apply_async(_warm_worker, (self,))
+        return worker
+
+    def _checkout_worker(self):
+        self._worker_slots.acquire()
+        with self._workers_lock:
+            worker = self._workers.pop() if self._workers else None
+        try:
+            if worker is None:
+                worker = self._start_worker()
+            # Startup is not part of the render budget
+            worker.ready.get(self.worker_start_timeout)
+        except BaseException:
+            if worker is not None:
+                worker.terminate()
+            self._worker_slots.release()
+            raise
+        return worker
+
+    def _checkin_worker(self, worker):
+        if worker is not None:
+            with self._workers_lock:
+                self._workers.append(worker)
+        self._worker_slots.release()
+
+    def render_many(self, texts) -> list:
+        """Render an iterable of markdown texts, in order."""
+        return [self.render(text) for text in texts]
+
+    def __call__(self, md_text: str) -> str:
+        return self.render(md_text)
+
+
+def escape_plain(md_text: str) -> str:
+    """Fallback output: the raw text, HTML-escaped, in a single paragraph."""
+    return '<p>' + html.escape(md_text).replace('\n', '<br />\n') + '</p>'
+
+
+# Renderers unpickled in a guarded-render worker, by fingerprint, so the
+# pipeline built while warming up is reused by every render
+_worker_renderers = {}
+
+
+def _worker_renderer(renderer):
+    return _worker_renderers.setdefault(renderer.fingerprint, renderer)
+
+
+def _warm_worker(renderer):
+    _worker_renderer(renderer)._pipeline()
+
+
+def _render_in_worker(renderer, md_text):
+    return _worker_renderer(renderer).render(md_text)
+
+
+_renderers = {}
+
+
+def _config_key(tags, attrs, protocols):
+    return (
+        tuple(tags or ()),
+        tuple(sorted((tag, tuple(names)) for tag, names in (attrs or {}).items())),
+        tuple(protocols or ()),
+    )
 
 
 def render(md_text: str, *, tags=None, attrs=None, protocols=None) -> str:
     """Render markdown text to sanitized HTML."""
     if not md_text:
         return ''
-    html = _md.markdown(md_text, extensions=['extra', 'sane_lists', 'nl2br'])
-    cleaned = bleach.clean(
-        html,
-        tags=tags or DEFAULT_TAGS,
-        attributes=attrs or DEFAULT_ATTRS,
-        protocols=protocols or DEFAULT_PROTOCOLS,
-        strip=True,
-    )
-    cleaned = re.sub(
-        r"<a(?![^>]*\brel=)([^>]*)>",
-        r'<a\1 rel="nofollow noopener">',
-        cleaned,
-        flags=re.IGNORECASE,
-    )
-    return cleaned
+    key = _config_key(tags, attrs, protocols)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        renderer = _renderers.setdefault(
+            key, Renderer(tags=tags, attrs=attrs, protocols=protocols)
+        )
+    return renderer.render(md_text)
@@ -0,0 +1,63 @@
+// Live markdown preview for submit form textareas marked with data-preview
+(function () {
+  var DELAY = 500;
+  var timers = Object.create(null);
+  var lastSent = Object.create(null);
+  var inflight = Object.create(null);
+
+  function previewBox(textarea) {
+    var box = textarea.parentNode.querySelector('.preview[data-preview-for="' + textarea.name + '"]');
+    if (!box) {
+      box = document.createElement('div');
+      box.className = 'preview';
+      box.setAttribute('data-preview-for', textarea.name);
+      box.setAttribute('aria-live', 'polite');
+      textarea.parentNode.insertBefore(box, textarea.nextSibling);
+    }
+    return box;
+  }
+
+  function send(textarea) {
+    var form = textarea.form;
+    var url = form && form.getAttribute('data-preview-url');
+    if (!url) return;
+    var field = textarea.getAttribute('data-preview');
+    var text = textarea.value;
+    if (lastSent[field] === text) return;
+    lastSent[field] = text;
+    if (inflight[field]) inflight[field].abort();
+    var ctrl = inflight[field] = new AbortController();
+    var body = new FormData();
+    body.append('field', field);
+    body.append('text', text);
+    var token = form.querySelector('input[name="csrfmiddlewaretoken"]');
+    fetch(url, {
+      method: 'POST',
+      body: body,
+      signal: ctrl.signal,
+      credentials: 'same-origin',
+      headers: { 'X-CSRFToken': token ? token.value : '', 'X-Requested-With': 'XMLHttpRequest' }
+    })
+      .then(function (r) {
+        if (!r.ok) { lastSent[field] = null; return null; }
+        return r.text();
+      })
+      .then(function (html) {
+        if (html === null) return;
+        var box = previewBox(textarea);
+        box.innerHTML = html;
+        box.hidden = !html;
+      })
+      .catch(function () {})
+      .then(function () { if (inflight[field] === ctrl) inflight[field] = null; });
+  }
+
+  // Delegated so it keeps working after PJAX swaps the page body
+  document.addEventListener('input', function (e) {
+    var t = e.target;
+    if (!t || t.tagName !== 'TEXTAREA' || !t.hasAttribute('data-preview')) return;
+    var field = t.getAttribute('data-preview');
+    clearTimeout(timers[field]);
+    timers[field] = setTimeout(function () { send(t); }, DELAY);
+  });
+})();